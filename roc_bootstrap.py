@@ -87,7 +87,8 @@ DEFAULT_CONFIG = {
         "connection_timeout": 3,
         "discovery_method": "arp_scan",  # "brute_force" or "arp_scan" or "config_only"
         "common_camera_ips": [],  # User can specify known camera ranges
-        "rtsp_test_enabled": True
+        "rtsp_test_enabled": True,
+        "max_concurrent_starts": 4  # FFmpeg processes spawned at once by Phase 2
     },
     "obs": {
         "host": "127.0.0.1",
@@ -95,6 +96,8 @@ DEFAULT_CONFIG = {
         "password": "",
         "websocket_timeout": 10,
         "reconnect_attempts": 5,
+        "max_concurrent": 2,  # In-flight scene requests; halved automatically on errors
+        "max_retries": 2,
         "scenes": {
             "default": "Default Scene",
             "break": "Break Scene", 
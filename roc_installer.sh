@@ -387,6 +387,9 @@ setup_python_environment() {
     local python_packages=(
         "asyncio-mqtt>=0.11.0"
         "websockets>=10.0"
+        "orjson>=3.6.0"
+        "uvloop>=0.17.0"
+        "inotify_simple>=1.3.5"
         "aiohttp>=3.8.0"
         "selenium>=4.0.0"
         "beautifulsoup4>=4.10.0"
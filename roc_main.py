@@ -14,21 +14,45 @@ Enhanced version with:
 
 import os
 import sys
+import builtins
 import json
 import time
+import random
+import re
 import asyncio
 import signal
+import contextlib
 import logging
-import subprocess
+import logging.handlers
 import threading
 import queue
 import hashlib
+import types
+import concurrent.futures
+import multiprocessing
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Callable
+from typing import Dict, List, Mapping, NamedTuple, Optional, Any, Callable, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
+from collections import ChainMap
+from operator import attrgetter, ge, gt, le, lt
 import importlib.util
 
+try:
+    import orjson
+except ImportError:  # Optional speedup; stdlib json is the fallback
+    orjson = None
+
+try:
+    import uvloop
+except ImportError:  # Optional speedup; default asyncio loop is the fallback
+    uvloop = None
+
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:  # Linux-only; the pause watcher polls without it
+    INotify = None
+
 # Add the path to import modules
 sys.path.insert(0, str(Path(__file__).parent))
 
@@ -38,6 +62,55 @@ CONFIG_DIR = Path("/etc/roc")
 LOG_DIR = Path("/var/log/roc")
 MODULES_DIR = Path("/opt/roc/modules")
 
+# Pre-bound for the reconnect backoff path
+_rand = random.random
+
+# Monotonic clock for elapsed-time checks; time.time() is kept for wall-clock records
+_now = time.monotonic
+
+def _json_loads(raw: bytes) -> Any:
+    """Parse JSON bytes, using orjson when available."""
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+def _json_dumps_pretty(obj: Any) -> bytes:
+    """Serialize to indented UTF-8 JSON bytes, using orjson when available."""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode()
+
+# Placeholder for absent fields in memoization keys
+_MISSING = object()
+
+# Parsed JSON config cache: path -> ((st_mtime_ns, st_size), blake2b digest, parsed data)
+_CONFIG_CACHE: Dict[Path, Tuple[Tuple[int, int], bytes, Any]] = {}
+
+def _load_json_cached(path: Path) -> Any:
+    """Load a JSON config file, reusing the parsed result while its content is unchanged.
+    
+    A matching (mtime, size) stat signature skips the read entirely; otherwise the
+    content digest guards against touch/rewrite-without-change before re-parsing.
+    Callers must treat the returned object as read-only since it is shared.
+    """
+    st = path.stat()
+    sig = (st.st_mtime_ns, st.st_size)
+    cached = _CONFIG_CACHE.get(path)
+    if cached and cached[0] == sig:
+        return cached[2]
+        
+    raw = path.read_bytes()
+    digest = hashlib.blake2b(raw, digest_size=16).digest()
+    if cached and cached[1] == digest:
+        _CONFIG_CACHE[path] = (sig, digest, cached[2])
+        return cached[2]
+        
+    data = _json_loads(raw)
+    _CONFIG_CACHE[path] = (sig, digest, data)
+    return data
+
+# Connection quality fixed-point scale and per-healthy-tick recovery step (~1%)
+QUALITY_MAX = 65535
+QUALITY_STEP = 655
+
 class ConnectionState(Enum):
     """Enhanced connection state enumeration."""
     DISCONNECTED = "disconnected"
@@ -63,9 +136,14 @@ class ConnectionStatus:
     last_attempt: float = 0
     reconnect_attempts: int = 0
     total_failures: int = 0
-    throttle_until: float = 0
+    throttle_until: float = 0  # _now() deadline
     error_message: str = ""
-    connection_quality: float = 1.0  # 0-1 scale
+    connection_quality: int = QUALITY_MAX  # 16-bit fixed point, QUALITY_MAX == 1.0
+    
+    @property
+    def quality_float(self) -> float:
+        """Connection quality on a 0-1 scale for display."""
+        return self.connection_quality / QUALITY_MAX
 
 @dataclass
 class CameraStatus:
@@ -75,12 +153,18 @@ class CameraStatus:
     device_index: int
     connection_status: ConnectionStatus
     stream_active: bool = False
-    ffmpeg_process: Optional[subprocess.Popen] = None
-    last_frame_time: float = 0
+    ffmpeg_process: Optional[asyncio.subprocess.Process] = None
+    last_frame_time: float = 0  # _now() timestamp
     frame_count: int = 0
     error_count: int = 0
     restart_count: int = 0
 
+@dataclass
+class HealthStats:
+    """Aggregate health counts reported by a manager."""
+    active: int = 0
+    failed: int = 0
+
 class ConnectionManager:
     """Enhanced connection manager with exponential backoff and health monitoring."""
     
@@ -88,6 +172,10 @@ class ConnectionManager:
         self.config = config
         self.logger = logger
         self.connections: Dict[str, Dict[str, Any]] = {}
+        self._statuses: Dict[str, ConnectionStatus] = {}
+        self._statuses_view = types.MappingProxyType(self._statuses)
+        # Flat (name, conn_info, status) entries swept by the monitor loop
+        self._monitor_entries: List[Tuple[str, Dict[str, Any], ConnectionStatus]] = []
         self.user_input_queue = queue.Queue()
         self.running = True
         
@@ -103,17 +191,21 @@ class ConnectionManager:
             'auto_reconnect': auto_reconnect,
             'max_attempts': max_attempts,
             'base_delay': base_delay,
-            'connection_obj': None
+            'connection_obj': None,
+            # Resolve sync/async once; the monitor loop branches on these every tick
+            'test_is_async': asyncio.iscoroutinefunction(test_func),
+            'connect_is_async': asyncio.iscoroutinefunction(connect_func)
         }
+        self._statuses[name] = self.connections[name]['status']
+        self._monitor_entries = [(n, info, info['status']) for n, info in self.connections.items()]
         self.logger.info(f"Registered connection: {name}")
         
     def calculate_backoff_delay(self, attempts: int, base_delay: float) -> float:
         """Calculate exponential backoff delay with jitter."""
-        import random
         max_delay = 60.0  # Cap at 1 minute
         delay = min(base_delay * (2 ** attempts), max_delay)
         # Add jitter to prevent thundering herd
-        jitter = delay * 0.1 * random.random()
+        jitter = delay * 0.1 * _rand()
         return delay + jitter
         
     async def test_connection(self, name: str) -> bool:
@@ -123,7 +215,7 @@ class ConnectionManager:
             
         try:
             conn_info = self.connections[name]
-            if asyncio.iscoroutinefunction(conn_info['test_func']):
+            if conn_info['test_is_async']:
                 return await conn_info['test_func']()
             else:
                 # Run sync function in executor
@@ -182,8 +274,8 @@ class ConnectionManager:
         input_thread.start()
         
         # Wait for response or timeout
-        start_time = time.time()
-        while time.time() - start_time < 30:
+        start_time = _now()
+        while _now() - start_time < 30:
             try:
                 response_name, response = self.user_input_queue.get(timeout=1)
                 if response_name == name:
@@ -224,7 +316,7 @@ class ConnectionManager:
             
             status.state = ConnectionState.CONNECTING
             
-            if asyncio.iscoroutinefunction(conn_info['connect_func']):
+            if conn_info['connect_is_async']:
                 connection_obj = await conn_info['connect_func']()
             else:
                 loop = asyncio.get_event_loop()
@@ -236,7 +328,7 @@ class ConnectionManager:
                 status.last_connected = time.time()
                 status.reconnect_attempts = 0
                 status.error_message = ""
-                status.connection_quality = 1.0
+                status.connection_quality = QUALITY_MAX
                 
                 self.logger.info(f"Successfully reconnected to {name}")
                 return True
@@ -248,7 +340,7 @@ class ConnectionManager:
             status.last_attempt = time.time()
             
             delay = self.calculate_backoff_delay(status.reconnect_attempts, conn_info['base_delay'])
-            status.throttle_until = time.time() + delay
+            status.throttle_until = _now() + delay
             
             self.logger.warning(f"Reconnection to {name} failed (attempt {status.reconnect_attempts}): {e}")
             self.logger.info(f"Will retry in {delay:.2f} seconds")
@@ -262,24 +354,24 @@ class ConnectionManager:
         
         while self.running:
             try:
-                current_time = time.time()
+                current_time = _now()
                 
-                for name, conn_info in self.connections.items():
-                    status = conn_info['status']
-                    
+                for name, conn_info, status in self._monitor_entries:
                     # Skip if throttled or disabled
-                    if current_time < status.throttle_until or status.state == ConnectionState.DISABLED:
+                    state = status.state
+                    if current_time < status.throttle_until or state is ConnectionState.DISABLED:
                         continue
                         
-                    if status.state == ConnectionState.CONNECTED:
+                    if state is ConnectionState.CONNECTED:
                         # Test existing connection
                         if not await self.test_connection(name):
                             await self.handle_disconnection(name, "Connection test failed")
                         else:
                             # Update connection quality based on response time
-                            status.connection_quality = min(status.connection_quality * 1.01, 1.0)
+                            q = status.connection_quality + QUALITY_STEP
+                            status.connection_quality = q if q < QUALITY_MAX else QUALITY_MAX
                             
-                    elif status.state == ConnectionState.RECONNECTING:
+                    elif state is ConnectionState.RECONNECTING:
                         # Attempt reconnection
                         await self.attempt_reconnection(name)
                         
@@ -293,9 +385,19 @@ class ConnectionManager:
         """Get connection status for a specific connection."""
         return self.connections.get(name, {}).get('status')
         
-    def get_all_statuses(self) -> Dict[str, ConnectionStatus]:
-        """Get all connection statuses."""
-        return {name: info['status'] for name, info in self.connections.items()}
+    def get_all_statuses(self) -> Mapping[str, ConnectionStatus]:
+        """Get a read-only view of all connection statuses."""
+        return self._statuses_view
+        
+    @property
+    def stats(self) -> HealthStats:
+        """Connected and failed service counts, in one pass over the statuses."""
+        stats = HealthStats()
+        for status in self._statuses.values():
+            state = status.state
+            stats.active += state is ConnectionState.CONNECTED
+            stats.failed += state is ConnectionState.FAILED
+        return stats
         
     def shutdown(self):
         """Shutdown connection manager."""
@@ -309,9 +411,15 @@ class CameraManager:
         self.config = config
         self.logger = logger
         self.cameras: Dict[str, CameraStatus] = {}
+        self._cameras_view = types.MappingProxyType(self.cameras)
         self.camera_config = self.load_camera_config()
+        self._camera_by_name = self._index_camera_config(self.camera_config)
         self.running = True
         
+        # Bounds concurrent FFmpeg spawns; created on first use inside the running loop
+        self.max_concurrent_starts = self.config.get('cameras', {}).get('max_concurrent_starts', 4)
+        self._spawn_sem: Optional[asyncio.Semaphore] = None
+        
     def load_camera_config(self) -> Dict[str, Any]:
         """Load camera configuration from file."""
         camera_config_file = Path(self.config.get('cameras', {}).get('config_file', '/etc/roc/cameras.json'))
@@ -321,12 +429,24 @@ class CameraManager:
             return {"cameras": []}
             
         try:
-            with open(camera_config_file, 'r') as f:
-                return json.load(f)
+            return _load_json_cached(camera_config_file)
         except Exception as e:
             self.logger.error(f"Failed to load camera config: {e}")
             return {"cameras": []}
             
+    @staticmethod
+    def _camera_id(camera_info: Dict[str, Any]) -> str:
+        """Derive the camera ID used as the key in self.cameras."""
+        return camera_info.get('name', f"camera_{camera_info.get('id', 'unknown')}")
+        
+    def _index_camera_config(self, camera_config: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Index enabled camera entries by camera ID for O(1) lookup on (re)start."""
+        return {
+            self._camera_id(c): c
+            for c in camera_config.get('cameras', [])
+            if c.get('enabled', True)
+        }
+        
     def initialize_cameras(self):
         """Initialize all cameras from configuration."""
         cameras_list = self.camera_config.get('cameras', [])
@@ -335,7 +455,7 @@ class CameraManager:
             if not camera_info.get('enabled', True):
                 continue
                 
-            camera_id = camera_info.get('name', f"camera_{camera_info.get('id', 'unknown')}")
+            camera_id = self._camera_id(camera_info)
             
             camera_status = CameraStatus(
                 camera_id=camera_id,
@@ -354,7 +474,7 @@ class CameraManager:
             return False
             
         camera = self.cameras[camera_id]
-        camera_config = next((c for c in self.camera_config['cameras'] if c.get('name') == camera_id), None)
+        camera_config = self._camera_by_name.get(camera_id)
         
         if not camera_config:
             self.logger.error(f"No configuration found for camera: {camera_id}")
@@ -403,19 +523,21 @@ class CameraManager:
                 
             self.logger.info(f"Starting FFmpeg for {camera_id}: {' '.join(ffmpeg_cmd[:10])}...")
             
-            # Start FFmpeg process
-            process = subprocess.Popen(
-                ffmpeg_cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                universal_newlines=True
-            )
+            # Start FFmpeg process (asyncio-managed so stop/wait never block the loop)
+            if self._spawn_sem is None:
+                self._spawn_sem = asyncio.Semaphore(self.max_concurrent_starts)
+            async with self._spawn_sem:
+                process = await asyncio.create_subprocess_exec(
+                    *ffmpeg_cmd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
+                )
             
             camera.ffmpeg_process = process
             camera.stream_active = True
             camera.connection_status.state = ConnectionState.CONNECTED
             camera.connection_status.last_connected = time.time()
-            camera.last_frame_time = time.time()
+            camera.last_frame_time = _now()
             
             self.logger.info(f"FFmpeg started for {camera_id} (PID: {process.pid})")
             return True
@@ -436,15 +558,16 @@ class CameraManager:
         if camera.ffmpeg_process:
             try:
                 self.logger.info(f"Stopping FFmpeg for {camera_id} (PID: {camera.ffmpeg_process.pid})")
-                camera.ffmpeg_process.terminate()
+                if camera.ffmpeg_process.returncode is None:
+                    camera.ffmpeg_process.terminate()
                 
                 # Wait for graceful termination
                 try:
-                    camera.ffmpeg_process.wait(timeout=5)
-                except subprocess.TimeoutExpired:
+                    await asyncio.wait_for(camera.ffmpeg_process.wait(), timeout=5.0)
+                except asyncio.TimeoutError:
                     self.logger.warning(f"FFmpeg for {camera_id} didn't terminate gracefully, killing...")
                     camera.ffmpeg_process.kill()
-                    camera.ffmpeg_process.wait()
+                    await camera.ffmpeg_process.wait()
                     
                 camera.ffmpeg_process = None
                 
@@ -462,13 +585,13 @@ class CameraManager:
         camera = self.cameras[camera_id]
         
         # Check if FFmpeg process is running
-        if not camera.ffmpeg_process or camera.ffmpeg_process.poll() is not None:
+        if not camera.ffmpeg_process or camera.ffmpeg_process.returncode is not None:
             self.logger.warning(f"FFmpeg process for {camera_id} is not running")
             camera.stream_active = False
             return False
             
         # Check if we're receiving frames (basic check)
-        current_time = time.time()
+        current_time = _now()
         if current_time - camera.last_frame_time > 30:  # 30 seconds without frames
             self.logger.warning(f"No frames received from {camera_id} for 30 seconds")
             return False
@@ -476,20 +599,16 @@ class CameraManager:
         # Check FFmpeg stderr for errors
         try:
             if camera.ffmpeg_process.stderr:
-                # Non-blocking read of stderr
-                import fcntl
-                import os
-                fd = camera.ffmpeg_process.stderr.fileno()
-                fl = fcntl.fcntl(fd, fcntl.F_GETFL)
-                fcntl.fcntl(fd, fcntl.F_SETFL, fl | os.O_NONBLOCK)
-                
+                # Drain whatever stderr is buffered without waiting for more
                 try:
-                    stderr_data = camera.ffmpeg_process.stderr.read()
-                    if stderr_data and "error" in stderr_data.lower():
-                        self.logger.warning(f"FFmpeg errors detected for {camera_id}: {stderr_data[:200]}")
-                        return False
-                except:
-                    pass  # No data available, that's OK
+                    stderr_data = await asyncio.wait_for(camera.ffmpeg_process.stderr.read(65536), timeout=0.1)
+                except asyncio.TimeoutError:
+                    stderr_data = b""  # No data available, that's OK
+                    
+                stderr_text = stderr_data.decode(errors='replace')
+                if stderr_text and "error" in stderr_text.lower():
+                    self.logger.warning(f"FFmpeg errors detected for {camera_id}: {stderr_text[:200]}")
+                    return False
                     
         except Exception as e:
             self.logger.debug(f"Error checking FFmpeg stderr for {camera_id}: {e}")
@@ -569,15 +688,145 @@ class CameraManager:
         """Get status for a specific camera."""
         return self.cameras.get(camera_id)
         
-    def get_all_camera_statuses(self) -> Dict[str, CameraStatus]:
-        """Get all camera statuses."""
-        return self.cameras.copy()
+    def get_all_camera_statuses(self) -> Mapping[str, CameraStatus]:
+        """Get a read-only view of all camera statuses."""
+        return self._cameras_view
+        
+    @property
+    def stats(self) -> HealthStats:
+        """Streaming and failed camera counts, in one pass over the cameras."""
+        stats = HealthStats()
+        for camera in self.cameras.values():
+            stats.active += camera.stream_active
+            stats.failed += camera.connection_status.state is ConnectionState.FAILED
+        return stats
         
     def shutdown(self):
         """Shutdown camera manager."""
         self.running = False
         self.logger.info("Camera manager shutting down...")
 
+_rule_logger = logging.getLogger("ROC-Main")
+
+def _evaluate_condition(condition: Dict[str, Any], data: Mapping[str, Any]) -> bool:
+    """Evaluate a single condition against scoreboard data."""
+    field = condition.get('field')
+    operator = condition.get('operator')
+    expected_value = condition.get('value')
+    
+    if field not in data:
+        return False
+    
+    actual_value = data[field]
+    
+    try:
+        if operator == "==":
+            return actual_value == expected_value
+        elif operator == "!=":
+            return actual_value != expected_value
+        elif operator == ">":
+            return float(actual_value) > float(expected_value)
+        elif operator == ">=":
+            return float(actual_value) >= float(expected_value)
+        elif operator == "<":
+            return float(actual_value) < float(expected_value)
+        elif operator == "<=":
+            return float(actual_value) <= float(expected_value)
+        elif operator == "contains":
+            return str(expected_value) in str(actual_value)
+        elif operator == "regex":
+            return bool(re.search(str(expected_value), str(actual_value)))
+        else:
+            _rule_logger.warning(f"Unknown operator: {operator}")
+            return False
+    except Exception as e:
+        _rule_logger.debug(f"Condition evaluation error: {e}")
+        return False
+
+# Builtins visible to custom rule code; without an explicit entry exec() grants all of them
+_SAFE_BUILTINS = {
+    name: getattr(builtins, name)
+    for name in (
+        'abs', 'all', 'any', 'bool', 'dict', 'enumerate', 'Exception', 'float', 'int',
+        'isinstance', 'len', 'list', 'max', 'min', 'range', 'round', 'set', 'sorted',
+        'str', 'sum', 'tuple', 'zip',
+    )
+}
+
+_NUMERIC_OPERATORS = {">": gt, ">=": ge, "<": lt, "<=": le}
+
+def _never(data: Mapping[str, Any]) -> bool:
+    return False
+
+def _compile_condition(condition: Dict[str, Any]) -> Callable[[Mapping[str, Any]], bool]:
+    """Translate a condition into a predicate over scoreboard data.
+    
+    Same semantics as _evaluate_condition, but the operator dispatch and the
+    coercion of the expected value happen once here rather than on every tick.
+    """
+    field = condition.get('field')
+    operator = condition.get('operator')
+    expected_value = condition.get('value')
+    
+    if operator == "==":
+        test = lambda actual: actual == expected_value
+    elif operator == "!=":
+        test = lambda actual: actual != expected_value
+    elif operator in _NUMERIC_OPERATORS:
+        compare = _NUMERIC_OPERATORS[operator]
+        try:
+            bound = float(expected_value)
+        except (TypeError, ValueError) as e:
+            _rule_logger.debug(f"Condition evaluation error: {e}")
+            return _never
+        test = lambda actual: compare(float(actual), bound)
+    elif operator == "contains":
+        needle = str(expected_value)
+        test = lambda actual: needle in str(actual)
+    elif operator == "regex":
+        try:
+            pattern = re.compile(str(expected_value))
+        except re.error as e:
+            _rule_logger.debug(f"Condition evaluation error: {e}")
+            return _never
+        test = lambda actual: pattern.search(str(actual)) is not None
+    else:
+        _rule_logger.warning(f"Unknown operator: {operator}")
+        return _never
+        
+    def check(data: Mapping[str, Any]) -> bool:
+        if field not in data:
+            return False
+        try:
+            return test(data[field])
+        except Exception as e:
+            _rule_logger.debug(f"Condition evaluation error: {e}")
+            return False
+            
+    return check
+
+class SceneRule(NamedTuple):
+    """An enabled scene rule with its config defaults resolved at load time."""
+    name: str
+    priority: int
+    conditions: Tuple[Dict[str, Any], ...]
+    checks: Tuple[Callable[[Mapping[str, Any]], bool], ...]  # Compiled conditions
+    action: Dict[str, Any]
+    min_duration: float
+    fields: Tuple[str, ...]  # Scoreboard fields the conditions read
+    heavy: bool
+
+def _rule_conditions_hold(conditions: Tuple[Dict[str, Any], ...], data: Mapping[str, Any]) -> bool:
+    """Check all rule conditions (AND logic).
+    
+    Module-level so 'heavy' rules can be evaluated in rule pool worker processes.
+    """
+    return all(_evaluate_condition(c, data) for c in conditions)
+
+def _rule_batch_holds(condition_sets: List[Tuple[Dict[str, Any], ...]], data: Mapping[str, Any]) -> List[bool]:
+    """Check several rules' conditions against one data snapshot in a pool worker."""
+    return [_rule_conditions_hold(conditions, data) for conditions in condition_sets]
+
 class SceneEngine:
     """Configuration-driven scene switching engine."""
     
@@ -585,19 +834,55 @@ class SceneEngine:
         self.config = config
         self.logger = logger
         self.current_scene = None
-        self.last_scene_change = 0
+        self.last_scene_change = float("-inf")  # _now() of last switch; none yet
         self.scene_rules = self.load_scene_rules()
+        self._condition_cache: Dict[Tuple[int, tuple, tuple], bool] = {}
+        self._condition_cache_size = 1024
+        self._code_cache: Dict[str, types.CodeType] = {}  # custom action source -> code
+        self._has_heavy_rules = False
+        
+        # Worker processes for 'heavy' rules, started on first use
+        self.rule_pool_workers = 2
+        self._rule_pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+        self._decision_list = self._compile_rules(self.scene_rules)
         self.obs_connection = None
         
+        # Logical scene name -> OBS scene name, resolved once from config
+        self._scene_mapping: Dict[str, str] = (config.get('obs') or {}).get('scenes') or {}
+        
+        # Scene switches are coalesced within this window before reaching OBS
+        self.scene_switch_debounce = 0.05
+        self._pending_scene: Optional[Tuple[str, str, float]] = None  # (scene, OBS scene, switched at)
+        self._confirmed_scene: Tuple[Optional[str], float] = (None, float("-inf"))  # Last scene OBS accepted
+        self._scene_switch_task: Optional[asyncio.Task] = None
+        
+        # Retry and time out OBS requests; the single flusher keeps one in flight
+        obs_config = config.get('obs') or {}
+        self.obs_max_retries = obs_config.get('max_retries', 2)
+        self.obs_timeout = obs_config.get('websocket_timeout', 10)
+        
+        # Globals reused by every custom code run; 'data' is rebound before each run
+        self._custom_globals = {
+            'switch_scene': self.switch_to_scene,
+            'logger': self.logger,
+            'asyncio': asyncio,
+            'time': time,
+            '__builtins__': _SAFE_BUILTINS,
+        }
+        
+        # In-flight action, cancelled when a higher-priority rule fires
+        self._current_action: Optional[Dict[str, Any]] = None
+        self._current_action_priority = 0
+        self._current_action_task: Optional[asyncio.Task] = None
+        
     def load_scene_rules(self) -> List[Dict[str, Any]]:
         """Load scene switching rules from configuration."""
         rules_file = CONFIG_DIR / "scene_rules.json"
         
         if rules_file.exists():
             try:
-                with open(rules_file, 'r') as f:
-                    rules_config = json.load(f)
-                    return rules_config.get('rules', [])
+                rules_config = _load_json_cached(rules_file)
+                return rules_config.get('rules', [])
             except Exception as e:
                 self.logger.error(f"Failed to load scene rules: {e}")
                 
@@ -653,107 +938,240 @@ class SceneEngine:
                 },
                 "rules": default_rules
             }
-            with open(rules_file, 'w') as f:
-                json.dump(rules_config, f, indent=4)
+            rules_file.write_bytes(_json_dumps_pretty(rules_config))
             self.logger.info(f"Created default scene rules at {rules_file}")
         except Exception as e:
             self.logger.warning(f"Could not save default scene rules: {e}")
             
         return default_rules
         
-    def evaluate_condition(self, condition: Dict[str, Any], data: Dict[str, Any]) -> bool:
-        """Evaluate a single condition against scoreboard data."""
-        field = condition.get('field')
-        operator = condition.get('operator')
-        expected_value = condition.get('value')
+    def _compile_rules(self, rules: List[Dict[str, Any]]) -> Tuple[SceneRule, ...]:
+        """Build the decision list: enabled rules, highest priority first.
         
-        if field not in data:
-            return False
+        Evaluation walks this list and stops at the first match, so most ticks
+        only evaluate the top rule or two. Python's stable sort keeps file order
+        between rules of equal priority.
+        """
+        self._condition_cache.clear()
+        self._code_cache.clear()
+        compiled = []
+        
+        for r in rules:
+            if not r.get('enabled', True):
+                continue
+                
+            conditions = tuple(r.get('conditions', []))
+            rule = SceneRule(
+                name=r.get('name', 'unnamed'),
+                priority=r.get('priority', 0),
+                conditions=conditions,
+                checks=tuple(_compile_condition(c) for c in conditions),
+                action=r.get('action') or {},
+                min_duration=r.get('min_duration', 0),
+                # Fields the rule reads, for memoizing condition results (see _conditions_match)
+                fields=tuple(sorted({c.get('field') for c in conditions})),
+                heavy=bool(r.get('heavy')),
+            )
+            compiled.append(rule)
             
-        actual_value = data[field]
+            # Compile custom action code once instead of on every trigger
+            if rule.action.get('type') == "custom" and rule.action.get('code'):
+                try:
+                    self._compile_custom_code(rule.action['code'], rule.name)
+                except SyntaxError as e:
+                    self.logger.error(f"Custom code in rule {rule.name} does not compile: {e}")
+                    
+        # Rules flagged 'heavy' are evaluated off the event loop (see _select_rule_offloaded)
+        self._has_heavy_rules = any(rule.heavy for rule in compiled)
         
-        try:
-            if operator == "==":
-                return actual_value == expected_value
-            elif operator == "!=":
-                return actual_value != expected_value
-            elif operator == ">":
-                return float(actual_value) > float(expected_value)
-            elif operator == ">=":
-                return float(actual_value) >= float(expected_value)
-            elif operator == "<":
-                return float(actual_value) < float(expected_value)
-            elif operator == "<=":
-                return float(actual_value) <= float(expected_value)
-            elif operator == "contains":
-                return str(expected_value) in str(actual_value)
-            elif operator == "regex":
-                import re
-                return bool(re.search(str(expected_value), str(actual_value)))
-            else:
-                self.logger.warning(f"Unknown operator: {operator}")
-                return False
-        except Exception as e:
-            self.logger.debug(f"Condition evaluation error: {e}")
+        return tuple(sorted(compiled, key=attrgetter('priority'), reverse=True))
+        
+    def _compile_custom_code(self, code: str, name: str = "custom") -> types.CodeType:
+        """Return the cached code object for custom action source, compiling on first use."""
+        compiled = self._code_cache.get(code)
+        if compiled is None:
+            compiled = self._code_cache[code] = compile(code, f"<rule:{name}>", 'exec')
+        return compiled
+        
+    def evaluate_condition(self, condition: Dict[str, Any], data: Mapping[str, Any]) -> bool:
+        """Evaluate a single condition against scoreboard data."""
+        return _evaluate_condition(condition, data)
+        
+    def evaluate_rule(self, rule: SceneRule, data: Mapping[str, Any]) -> bool:
+        """Evaluate if a rule should trigger based on current data."""
+        # Check minimum duration since last scene change first - it is the cheapest test
+        if _now() - self.last_scene_change < rule.min_duration:
             return False
             
-    def evaluate_rule(self, rule: Dict[str, Any], data: Dict[str, Any]) -> bool:
-        """Evaluate if a rule should trigger based on current data."""
-        conditions = rule.get('conditions', [])
+        return self._conditions_match(rule, data)
         
-        # All conditions must be true (AND logic)
-        for condition in conditions:
-            if not self.evaluate_condition(condition, data):
-                return False
-                
-        # Check minimum duration since last scene change
-        min_duration = rule.get('min_duration', 0)
-        current_time = time.time()
+    def _conditions_match(self, rule: SceneRule, data: Mapping[str, Any]) -> bool:
+        """Check all rule conditions (AND logic), memoized on the values they read.
         
-        if current_time - self.last_scene_change < min_duration:
-            return False
+        Conditions are pure functions of the referenced fields, so ticks where
+        those values repeat reuse the previous result instead of re-evaluating.
+        """
+        values = tuple(data.get(f, _MISSING) for f in rule.fields)
+        # Types are part of the key: 1, 1.0 and True hash alike but stringify differently
+        key = (id(rule), values, tuple(map(type, values)))
+        try:
+            return self._condition_cache[key]
+        except KeyError:
+            pass
+        except TypeError:  # Unhashable field value - evaluate uncached
+            key = None
             
-        return True
+        result = all(check(data) for check in rule.checks)
+        
+        if key is not None:
+            if len(self._condition_cache) >= self._condition_cache_size:
+                self._condition_cache.clear()
+            self._condition_cache[key] = result
+        return result
         
     async def process_scoreboard_data(self, data: Dict[str, Any]):
         """Process scoreboard data and execute scene rules."""
-        # Add derived fields
-        enhanced_data = data.copy()
+        # Layer derived fields over the raw data without copying it
+        overlay = {'game_just_started': False}
+        enhanced_data = ChainMap(overlay, data)
         
         # Detect game start
-        current_time = time.time()
         if 'game_time' in data and data['game_time'] > 0:
             if not hasattr(self, '_last_game_time') or self._last_game_time == 0:
-                enhanced_data['game_just_started'] = True
+                overlay['game_just_started'] = True
                 self.logger.info("Game start detected!")
-            else:
-                enhanced_data['game_just_started'] = False
-        else:
-            enhanced_data['game_just_started'] = False
-            
+                
         self._last_game_time = data.get('game_time', 0)
         
-        # Find the highest priority rule that matches
-        matching_rules = []
-        for rule in self.scene_rules:
-            if self.evaluate_rule(rule, enhanced_data):
-                matching_rules.append(rule)
-                
-        if not matching_rules:
+        # The decision list is priority-sorted, so the first match wins
+        if self._has_heavy_rules:
+            selected_rule = await self._select_rule_offloaded(enhanced_data)
+        else:
+            selected_rule = None
+            for rule in self._decision_list:
+                if self.evaluate_rule(rule, enhanced_data):
+                    selected_rule = rule
+                    break
+                    
+        if selected_rule is None:
             return
             
-        # Sort by priority (higher = more important)
-        matching_rules.sort(key=lambda r: r.get('priority', 0), reverse=True)
-        selected_rule = matching_rules[0]
-        
-        self.logger.info(f"Scene rule triggered: {selected_rule['name']}")
+        self.logger.info(f"Scene rule triggered: {selected_rule.name}")
         
         # Execute the action
-        action = selected_rule.get('action', {})
-        await self.execute_action(action, enhanced_data)
+        await self.execute_action(selected_rule.action, enhanced_data, selected_rule.priority)
+        
+    async def _select_rule_offloaded(self, data: Mapping[str, Any]) -> Optional[SceneRule]:
+        """First-match rule selection with 'heavy' rules run on the rule process pool.
+        
+        Heavy rules are submitted up front so the workers crunch them while light
+        rules are evaluated inline; priority order still decides the winner.
+        """
+        loop = asyncio.get_running_loop()
+        pool = self._get_rule_pool()
+        pending: Dict[int, Tuple[asyncio.Future, int]] = {}
+        now = _now()
+        
+        eligible = [rule for rule in self._decision_list
+                    if rule.heavy and now - self.last_scene_change >= rule.min_duration]
+        if eligible:
+            snapshot = dict(data)  # Flatten the ChainMap so it pickles
+            # One batch per worker, so the snapshot is pickled per worker rather than per rule
+            workers = min(self.rule_pool_workers, len(eligible))
+            for i in range(workers):
+                batch = eligible[i::workers]
+                future = loop.run_in_executor(
+                    pool, _rule_batch_holds, [rule.conditions for rule in batch], snapshot
+                )
+                for index, rule in enumerate(batch):
+                    pending[id(rule)] = (future, index)
+                    
+        try:
+            for rule in self._decision_list:
+                entry = pending.get(id(rule))
+                if entry is not None:
+                    future, index = entry
+                    try:
+                        matched = (await future)[index]
+                    except Exception as e:
+                        self.logger.warning(f"Rule pool evaluation of {rule.name} failed, evaluating inline: {e}")
+                        matched = self._conditions_match(rule, data)
+                elif rule.heavy:
+                    matched = False  # Still inside min_duration
+                else:
+                    matched = self.evaluate_rule(rule, data)
+                    
+                if matched:
+                    return rule
+            return None
+            
+        finally:
+            for future, _ in pending.values():
+                future.cancel()
+                
+    def _get_rule_pool(self) -> concurrent.futures.ProcessPoolExecutor:
+        """Return the rule evaluation process pool, creating it if needed.
+        
+        Workers are spawned rather than forked: by the time rules run, this process
+        has a logging listener thread and a live event loop a fork would copy.
+        """
+        if self._rule_pool is None:
+            self._rule_pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.rule_pool_workers, mp_context=multiprocessing.get_context('spawn')
+            )
+        return self._rule_pool
         
-    async def execute_action(self, action: Dict[str, Any], data: Dict[str, Any]):
+    async def start_rule_pool(self):
+        """Create the rule pool and bring its workers up before the first tick needs them."""
+        if not self._has_heavy_rules:
+            return
+        loop = asyncio.get_running_loop()
+        pool = self._get_rule_pool()
+        await asyncio.gather(*(loop.run_in_executor(pool, int) for _ in range(self.rule_pool_workers)))
+        
+    def shutdown(self):
+        """Release scene engine resources."""
+        if self._rule_pool is not None:
+            self._rule_pool.shutdown(wait=False)
+            self._rule_pool = None
+            
+    async def execute_action(self, action: Dict[str, Any], data: Mapping[str, Any], priority: int = 0):
+        """Start a scene action as a cancellable task.
+        
+        Returns once the action is scheduled, so a higher-priority rule firing on a
+        later tick can cut a breakout sequence or camera rotation short. Actions of
+        equal or lower priority leave the running one alone.
+        """
+        task = self._current_action_task
+        if task is not None and not task.done():
+            if self._current_action is action or priority <= self._current_action_priority:
+                return  # Let the running action finish
+            await self.cancel_current_action()
+            
+        self._current_action = action
+        self._current_action_priority = priority
+        self._current_action_task = asyncio.create_task(self._run_action(action, data))
+        
+    async def cancel_current_action(self):
+        """Cancel the in-flight scene action, if any, and wait for it to unwind."""
+        task = self._current_action_task
+        if task is not None and not task.done():
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+                
+    async def _run_action(self, action: Dict[str, Any], data: Mapping[str, Any]):
         """Execute a scene action."""
+        try:
+            await self._dispatch_action(action, data)
+        except asyncio.CancelledError:
+            self.logger.info(f"Scene action {action.get('type')} preempted")
+            raise
+        except Exception as e:
+            self.logger.error(f"Scene action {action.get('type')} failed: {e}")
+            
+    async def _dispatch_action(self, action: Dict[str, Any], data: Mapping[str, Any]):
+        """Run the handler for a scene action type."""
         action_type = action.get('type')
         
         if action_type == "switch_scene":
@@ -782,22 +1200,41 @@ class SceneEngine:
             self.logger.error("No OBS connection available for scene switch")
             return
             
-        scene_mapping = self.config.get('obs', {}).get('scenes', {})
-        obs_scene_name = scene_mapping.get(scene_name, scene_name)
+        obs_scene_name = self._scene_mapping.get(scene_name, scene_name)
         
-        try:
-            # This would integrate with your OBS WebSocket client
-            self.logger.info(f"Switching to scene: {obs_scene_name}")
-            
-            # Placeholder for actual OBS WebSocket call
-            # await self.obs_connection.set_current_scene(obs_scene_name)
+        self.logger.info(f"Switching to scene: {obs_scene_name}")
+        self.current_scene = scene_name
+        self.last_scene_change = _now()
+        
+        # Coalesce: only the latest target within the debounce window reaches OBS
+        self._pending_scene = (scene_name, obs_scene_name, self.last_scene_change)
+        if self._scene_switch_task is None or self._scene_switch_task.done():
+            self._scene_switch_task = asyncio.create_task(self._flush_scene_switch())
             
-            self.current_scene = scene_name
-            self.last_scene_change = time.time()
-            
-        except Exception as e:
-            self.logger.error(f"Failed to switch scene to {obs_scene_name}: {e}")
+    async def _flush_scene_switch(self):
+        """Send the most recent pending scene to OBS over the persistent connection."""
+        while self._pending_scene is not None:
+            await asyncio.sleep(self.scene_switch_debounce)
+            (scene_name, target, switched_at), self._pending_scene = self._pending_scene, None
             
+            for attempt in range(self.obs_max_retries + 1):
+                try:
+                    await asyncio.wait_for(
+                        self.obs_connection.set_current_scene(target), timeout=self.obs_timeout
+                    )
+                    self._confirmed_scene = (scene_name, switched_at)
+                    break
+                except Exception as e:
+                    self.logger.error(f"Failed to switch scene to {target} (attempt {attempt + 1}): {e}")
+                    if self._pending_scene is not None:
+                        break  # A newer target supersedes this one
+                    if attempt < self.obs_max_retries:
+                        await asyncio.sleep(0.1 * (2 ** attempt))
+            else:
+                # OBS never took it: report the scene it is actually showing
+                if self._pending_scene is None:
+                    self.current_scene, self.last_scene_change = self._confirmed_scene
+                    
     async def execute_breakout_sequence(self):
         """Execute the breakout sequence for game start."""
         self.logger.info("Executing breakout sequence...")
@@ -816,21 +1253,17 @@ class SceneEngine:
             await self.switch_to_scene(f"camera_{camera}")
             await asyncio.sleep(duration)
             
-    async def execute_custom_code(self, code: str, data: Dict[str, Any]):
+    async def execute_custom_code(self, code: str, data: Mapping[str, Any]):
         """Execute custom Python code (use with caution)."""
         self.logger.warning("Executing custom scene code - this could be dangerous!")
         
         try:
-            # Create a restricted execution environment
-            allowed_globals = {
-                'switch_scene': self.switch_to_scene,
-                'logger': self.logger,
-                'data': data,
-                'asyncio': asyncio,
-                'time': time
-            }
-            
-            exec(code, allowed_globals)
+            # Restricted execution environment
+            # 'data' must be a global: comprehensions, lambdas and nested defs
+            # inside the code cannot see exec locals
+            custom_globals = self._custom_globals
+            custom_globals['data'] = data
+            exec(self._compile_custom_code(code), custom_globals)
             
         except Exception as e:
             self.logger.error(f"Custom code execution failed: {e}")
@@ -845,32 +1278,40 @@ class ROCMainApplication:
         
         # System state
         self.system_state = SystemState.INITIALIZING
-        self.exit_flag = False
         
         # Core components
         self.connection_manager = ConnectionManager(self.config, self.logger)
         self.camera_manager = CameraManager(self.config, self.logger)
         self.scene_engine = SceneEngine(self.config, self.logger)
         
-        # Setup signal handlers
-        signal.signal(signal.SIGINT, self._signal_handler)
-        signal.signal(signal.SIGTERM, self._signal_handler)
-        
         # Pause file monitoring
         self.pause_file = Path("/tmp/roc-pause")
+        self._pause_file_present: Optional[bool] = None  # Kept current by inotify, else None
+        
+        # Set once the main loop is running; SIGINT/SIGTERM set it from the loop
+        self._shutdown_event: Optional[asyncio.Event] = None
         
     def setup_logging(self):
         """Configure logging system."""
         LOG_DIR.mkdir(parents=True, exist_ok=True)
         
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - [%(name)s] - %(message)s',
-            handlers=[
-                logging.FileHandler(LOG_DIR / "roc_main.log"),
-                logging.StreamHandler(sys.stdout)
-            ]
+        formatter = logging.Formatter('%(asctime)s - %(levelname)s - [%(name)s] - %(message)s')
+        output_handlers = [
+            logging.FileHandler(LOG_DIR / "roc_main.log", delay=True),
+            logging.StreamHandler(sys.stdout)
+        ]
+        for handler in output_handlers:
+            handler.setFormatter(formatter)
+            
+        # Log calls format the message and enqueue it; a listener thread does the disk/console I/O
+        self._log_queue = queue.SimpleQueue()
+        root_logger = logging.getLogger()
+        root_logger.setLevel(logging.INFO)
+        root_logger.addHandler(logging.handlers.QueueHandler(self._log_queue))
+        self._log_listener = logging.handlers.QueueListener(
+            self._log_queue, *output_handlers, respect_handler_level=True
         )
+        self._log_listener.start()
         
         self.logger = logging.getLogger("ROC-Main")
         self.logger.info("="*60)
@@ -887,9 +1328,7 @@ class ROCMainApplication:
             return
             
         try:
-            with open(status_file, 'r') as f:
-                self.phase1_status = json.load(f)
-                
+            self.phase1_status = _json_loads(status_file.read_bytes())
             self.logger.info("Loaded Phase 1 status information")
             
             # Log any critical issues from Phase 1
@@ -900,30 +1339,44 @@ class ROCMainApplication:
             self.logger.error(f"Failed to load Phase 1 status: {e}")
             self.phase1_status = {}
             
-    def _signal_handler(self, sig, frame):
-        """Handle shutdown signals."""
-        self.logger.info(f"Received signal {sig} - initiating shutdown")
-        self.exit_flag = True
+    def _signal_handler(self, sig: signal.Signals):
+        """Handle shutdown signals (called on the event loop)."""
+        self.logger.info(f"Received signal {sig.name} - initiating shutdown")
         self.system_state = SystemState.SHUTTING_DOWN
+        self._shutdown_event.set()
         
     def check_pause_state(self) -> bool:
         """Check if system is paused via pause file."""
-        if self.pause_file.exists():
-            if self.system_state != SystemState.PAUSED:
-                self.logger.info("System paused via pause file")
-                self.system_state = SystemState.PAUSED
-            return True
+        paused = self._pause_file_present
+        if paused is None:
+            paused = self.pause_file.exists()
+            
+        # Steady state: nothing changed, nothing to log
+        if paused is (self.system_state is SystemState.PAUSED):
+            return paused
+            
+        if paused:
+            self.logger.info("System paused via pause file")
+            self.system_state = SystemState.PAUSED
         else:
-            if self.system_state == SystemState.PAUSED:
-                self.logger.info("System unpaused - pause file removed")
-                self.system_state = SystemState.RUNNING
-            return False
+            self.logger.info("System unpaused - pause file removed")
+            self.system_state = SystemState.RUNNING
+        return paused
             
     async def run_main_loop(self) -> bool:
         """Enhanced main application loop."""
         self.logger.info("Starting enhanced main application loop...")
         
+        loop = asyncio.get_running_loop()
+        self._shutdown_event = asyncio.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self._signal_handler, sig)
+            
+        background: List[asyncio.Task] = []
         try:
+            # Spawn rule pool workers now rather than on the first heavy rule tick
+            await self.scene_engine.start_rule_pool()
+            
             # Initialize cameras
             self.camera_manager.initialize_cameras()
             
@@ -931,30 +1384,23 @@ class ROCMainApplication:
             await self.camera_manager.start_all_cameras()
             
             # Start monitoring tasks
-            monitor_task = asyncio.create_task(self.connection_manager.monitor_connections())
-            camera_monitor_task = asyncio.create_task(self.camera_manager.monitor_cameras())
+            background.append(asyncio.create_task(self.connection_manager.monitor_connections()))
+            background.append(asyncio.create_task(self.camera_manager.monitor_cameras()))
+            background.append(asyncio.create_task(self._health_logger()))
+            background.append(asyncio.create_task(self._pause_watcher()))
             
             # Set system state to running
             self.system_state = SystemState.RUNNING
             
-            # Main loop
-            while not self.exit_flag:
-                try:
-                    # Check pause state
-                    if self.check_pause_state():
-                        await asyncio.sleep(1)
-                        continue
-                        
-                    # Periodic system health checks
-                    if int(time.time()) % 60 == 0:  # Every minute
-                        await self.log_system_health()
-                        
-                    await asyncio.sleep(1)
-                    
-                except Exception as e:
-                    self.logger.error(f"Main loop iteration error: {e}")
+            # Main loop: sleep until a shutdown signal arrives or a background task dies
+            shutdown_task = asyncio.create_task(self._shutdown_event.wait())
+            done, _ = await asyncio.wait([shutdown_task, *background], return_when=asyncio.FIRST_COMPLETED)
+            shutdown_task.cancel()
+            
+            for task in done:
+                if task is not shutdown_task and not task.cancelled() and task.exception():
+                    self.logger.error(f"Background task failed: {task.exception()}")
                     self.system_state = SystemState.ERROR
-                    await asyncio.sleep(5)
                     
         except Exception as e:
             self.logger.error(f"Main loop critical error: {e}")
@@ -964,35 +1410,116 @@ class ROCMainApplication:
             # Cleanup
             self.logger.info("Shutting down ROC Main Application...")
             
-            # Cancel monitoring tasks
-            monitor_task.cancel()
-            camera_monitor_task.cancel()
+            # Cancel monitoring tasks and wait for them to unwind
+            for task in background:
+                task.cancel()
+            results = await asyncio.gather(*background, return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception):
+                    self.logger.error(f"Background task failed during shutdown: {result}")
             
-            # Stop all cameras
+            # Stop any running scene sequence and all cameras
+            await self.scene_engine.cancel_current_action()
             await self.camera_manager.stop_all_cameras()
             
             # Shutdown components
             self.connection_manager.shutdown()
             self.camera_manager.shutdown()
+            self.scene_engine.shutdown()
             
         return True
         
+    async def _health_logger(self):
+        """Log system health once a minute while not paused."""
+        loop = asyncio.get_running_loop()
+        next_health = loop.time() + 60
+        while True:
+            # Sleep to an absolute deadline so slow health logs don't drift the cadence
+            await asyncio.sleep(max(0.0, next_health - loop.time()))
+            next_health += 60
+            if self.system_state == SystemState.PAUSED:
+                continue
+                
+            try:
+                await self.log_system_health()
+            except Exception as e:
+                self.logger.error(f"Health logging error: {e}")
+                self.system_state = SystemState.ERROR
+                
+    async def _pause_watcher(self):
+        """Track the pause file and update system state on transitions.
+        
+        With inotify the watcher sleeps until the pause file's directory changes;
+        otherwise it polls the pause file once a second.
+        """
+        inotify = self._open_pause_inotify()
+        if inotify is None:
+            while True:
+                try:
+                    self.check_pause_state()
+                except Exception as e:
+                    self.logger.error(f"Pause check error: {e}")
+                await asyncio.sleep(1)
+                
+        loop = asyncio.get_running_loop()
+        changed = asyncio.Event()
+        loop.add_reader(inotify.fileno(), changed.set)
+        try:
+            # The watch is already in place, so no transition can slip past this first check
+            self._pause_file_present = self.pause_file.exists()
+            self.check_pause_state()
+            while True:
+                await changed.wait()
+                changed.clear()
+                if any(event.name == self.pause_file.name for event in inotify.read(timeout=0)):
+                    self._pause_file_present = self.pause_file.exists()
+                    try:
+                        self.check_pause_state()
+                    except Exception as e:
+                        self.logger.error(f"Pause check error: {e}")
+        finally:
+            self._pause_file_present = None
+            loop.remove_reader(inotify.fileno())
+            inotify.close()
+            
+    def _open_pause_inotify(self):
+        """Watch the pause file's directory with inotify, or return None to poll."""
+        if INotify is None:
+            return None
+            
+        try:
+            inotify = INotify()
+        except OSError as e:
+            self.logger.warning(f"inotify unavailable, polling pause file: {e}")
+            return None
+            
+        try:
+            mask = inotify_flags.CREATE | inotify_flags.DELETE | inotify_flags.MOVED_TO | inotify_flags.MOVED_FROM
+            inotify.add_watch(str(self.pause_file.parent), mask)
+        except OSError as e:
+            inotify.close()
+            self.logger.warning(f"Cannot watch {self.pause_file.parent}, polling pause file: {e}")
+            return None
+            
+        return inotify
+            
     async def log_system_health(self):
         """Log comprehensive system health information."""
-        camera_statuses = self.camera_manager.get_all_camera_statuses()
-        connection_statuses = self.connection_manager.get_all_statuses()
-        
-        active_cameras = sum(1 for c in camera_statuses.values() if c.stream_active)
-        failed_cameras = sum(1 for c in camera_statuses.values() if c.connection_status.state == ConnectionState.FAILED)
-        
-        connected_services = sum(1 for c in connection_statuses.values() if c.state == ConnectionState.CONNECTED)
-        failed_services = sum(1 for c in connection_statuses.values() if c.state == ConnectionState.FAILED)
+        cameras = self.camera_manager.stats
+        services = self.connection_manager.stats
         
         self.logger.info(f"System Health - State: {self.system_state.value}")
-        self.logger.info(f"  Cameras: {active_cameras} active, {failed_cameras} failed")
-        self.logger.info(f"  Services: {connected_services} connected, {failed_services} failed")
+        self.logger.info(f"  Cameras: {cameras.active} active, {cameras.failed} failed")
+        self.logger.info(f"  Services: {services.active} connected, {services.failed} failed")
         self.logger.info(f"  Current Scene: {self.scene_engine.current_scene}")
         
+    def stop_logging(self):
+        """Flush queued log records and stop the logging listener thread."""
+        listener = getattr(self, '_log_listener', None)
+        if listener is not None:
+            listener.stop()
+            self._log_listener = None
+            
     async def run(self) -> int:
         """Main application entry point."""
         try:
@@ -1010,6 +1537,10 @@ class ROCMainApplication:
 
 def main():
     """Main entry point for Phase 2."""
+    if uvloop:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        
+    app = None
     try:
         app = ROCMainApplication()
         return asyncio.run(app.run())
@@ -1019,6 +1550,9 @@ def main():
     except Exception as e:
         logging.error(f"Unhandled application error: {e}")
         return 1
+    finally:
+        if app is not None:
+            app.stop_logging()
 
 if __name__ == "__main__":
     sys.exit(main())
@@ -13,16 +13,39 @@ Advanced configuration-driven scene switching system with:
 - Hot-reload of rules
 """
 
+import sys
 import json
 import time
 import asyncio
 import logging
 import re
+from collections import ChainMap, deque
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Callable, Union
-from dataclasses import dataclass, asdict
+from typing import Deque, Dict, List, Mapping, Optional, Any, Callable, Tuple, Union
+from dataclasses import dataclass, field as dataclass_field
 from enum import Enum
 
+try:
+    import orjson
+except ImportError:  # Optional speedup; stdlib json is the fallback
+    orjson = None
+
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:  # Linux-only; rule reload checks stat() the file instead
+    INotify = None
+
+def _json_loads(raw: bytes) -> Any:
+    """Parse JSON bytes, using orjson when available."""
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+def _json_dumps_pretty(obj: Any) -> bytes:
+    """Serialize to indented UTF-8 JSON bytes, using orjson when available."""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode()
+
 class ActionType(Enum):
     """Types of scene actions."""
     SWITCH_SCENE = "switch_scene"
@@ -33,6 +56,9 @@ class ActionType(Enum):
     PARALLEL = "parallel"
     SEQUENCE = "sequence"
 
+# Position of each action type's handler in SceneEngineAdvanced.action_handlers
+_ACTION_IDS = {action_type: index for index, action_type in enumerate(ActionType)}
+
 class ConditionOperator(Enum):
     """Condition evaluation operators."""
     EQUALS = "=="
@@ -47,6 +73,74 @@ class ConditionOperator(Enum):
     CHANGED = "changed"
     STABLE_FOR = "stable_for"
 
+# Condition operator handlers, called as handler(engine, field, actual, expected, condition)
+_OPS: Dict[str, Callable[..., bool]] = {
+    "==": lambda engine, field, actual, expected, condition: engine._compare_values(actual, expected, "=="),
+    "!=": lambda engine, field, actual, expected, condition: engine._compare_values(actual, expected, "!="),
+    ">": lambda engine, field, actual, expected, condition: float(actual) > float(expected),
+    ">=": lambda engine, field, actual, expected, condition: float(actual) >= float(expected),
+    "<": lambda engine, field, actual, expected, condition: float(actual) < float(expected),
+    "<=": lambda engine, field, actual, expected, condition: float(actual) <= float(expected),
+    "contains": lambda engine, field, actual, expected, condition: str(expected).lower() in str(actual).lower(),
+    "regex": lambda engine, field, actual, expected, condition: engine._regex_search(expected, actual),
+    "in": lambda engine, field, actual, expected, condition: actual in expected,
+    "changed": lambda engine, field, actual, expected, condition: engine._check_value_changed(field, condition.get('from_value')),
+    "stable_for": lambda engine, field, actual, expected, condition: engine._check_value_stable(field, expected),
+}
+
+# Monotonic clock for intervals; time.time() is kept for reported wall-clock timestamps
+_now = time.monotonic
+
+# Relative cost of each operator; cheap conditions run first so the AND short-circuits early
+_CONDITION_COST = {
+    "==": 0, "!=": 0, ">": 0, ">=": 0, "<": 0, "<=": 0,
+    "in": 1, "contains": 2, "changed": 3, "stable_for": 4, "regex": 5,
+}
+
+def _condition_cost(condition: Dict[str, Any]) -> int:
+    return _CONDITION_COST.get(condition.get('operator'), 9)
+
+# Operator codes for numeric conditions whose value is pre-coerced at load (see _num_cmp)
+_NUMERIC_OP_CODES = {"==": 0, "!=": 1, ">": 2, ">=": 3, "<": 4, "<=": 5}
+
+def _num_cmp(op: int, a: float, b: float) -> bool:
+    """Compare two floats by numeric operator code."""
+    if op == 0:
+        return abs(a - b) < 0.001  # Float tolerance, as in _compare_values
+    elif op == 1:
+        return abs(a - b) >= 0.001
+    elif op == 2:
+        return a > b
+    elif op == 3:
+        return a >= b
+    elif op == 4:
+        return a < b
+    return a <= b
+
+# Flat compiled condition: (field, numeric op code or -1, float value, source condition)
+CompiledCondition = Tuple[Any, int, float, Dict[str, Any]]
+
+def _intern_keys(mapping: Dict[str, Any], *keys: str):
+    """Intern the string values of the given keys, so later dict lookups hit pointer equality."""
+    for key in keys:
+        value = mapping.get(key)
+        if type(value) is str:
+            mapping[key] = sys.intern(value)
+
+def _compile_condition(condition: Dict[str, Any]) -> CompiledCondition:
+    """Flatten a condition, pre-coercing the value of numeric comparisons."""
+    _intern_keys(condition, 'field', 'operator')
+    op_code = _NUMERIC_OP_CODES.get(condition.get('operator'))
+    if op_code is not None:
+        try:
+            return (condition.get('field'), op_code, float(condition.get('value')), condition)
+        except (TypeError, ValueError):
+            pass  # Non-numeric value - evaluated by the generic handler
+    return (condition.get('field'), -1, 0.0, condition)
+
+# Optional rule keys copied straight from JSON; absent keys keep the SceneRule defaults
+_RULE_OPTIONAL_KEYS = ('min_duration', 'max_duration', 'cooldown', 'enabled', 'description')
+
 @dataclass
 class SceneRule:
     """Scene switching rule definition."""
@@ -59,6 +153,20 @@ class SceneRule:
     cooldown: float = 0
     enabled: bool = True
     description: str = ""
+    compiled_conditions: Tuple[CompiledCondition, ...] = dataclass_field(default=(), repr=False, compare=False)
+    
+    @classmethod
+    def from_dict(cls, rule_data: Dict[str, Any]) -> "SceneRule":
+        """Build a rule from its JSON definition, with conditions cost-ordered and compiled."""
+        conditions = sorted(rule_data.get('conditions', []), key=_condition_cost)
+        return cls(
+            name=rule_data['name'],
+            priority=rule_data.get('priority', 50),
+            conditions=conditions,
+            actions=rule_data.get('actions', []),
+            compiled_conditions=tuple(_compile_condition(c) for c in conditions),
+            **{key: rule_data[key] for key in _RULE_OPTIONAL_KEYS if key in rule_data}
+        )
 
 @dataclass 
 class RuleExecutionMetrics:
@@ -70,6 +178,18 @@ class RuleExecutionMetrics:
     success_count: int = 0
     failure_count: int = 0
     average_execution_time: float = 0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Flat dict of the metrics; all fields are primitives, so no deep copy is needed."""
+        return {
+            'rule_name': self.rule_name,
+            'execution_count': self.execution_count,
+            'last_executed': self.last_executed,
+            'total_execution_time': self.total_execution_time,
+            'success_count': self.success_count,
+            'failure_count': self.failure_count,
+            'average_execution_time': self.average_execution_time,
+        }
 
 class SceneEngineAdvanced:
     """Advanced scene switching engine with comprehensive rule support."""
@@ -81,18 +201,39 @@ class SceneEngineAdvanced:
         
         # State tracking
         self.current_scene = None
-        self.last_scene_change = 0
-        self.scene_history = []
-        self.data_history = {}
+        self.last_scene_change = 0  # Wall-clock time of the last switch, for reporting
+        self._scene_changed_at = float("-inf")  # _now() of the last switch; none yet
+        self.scene_history: Deque[Dict[str, Any]] = deque(maxlen=20)  # Last 20 scenes
+        self.data_history: Dict[str, Deque[Dict[str, Any]]] = {}  # Last 2 values per field
+        self._last_change_ts: Dict[str, float] = {}  # When each field last took a new value
+        self._frame_fields: frozenset = frozenset()  # Fields present in the previous frame
+        self._recent_scenes: Optional[List[Dict[str, Any]]] = None  # Last 5 scenes, rebuilt on change
         self.rule_metrics = {}
+        self._rule_last_run: Dict[str, float] = {}  # _now() of each rule's last successful run
         
         # Rule management
         self.rules = []
         self.rules_file = Path(config.get('scene_rules_file', '/etc/roc/scene_rules.json'))
         self.last_rules_reload = 0
+        self._regex_cache: Dict[str, re.Pattern] = {}  # Compiled 'regex' condition patterns
         
-        # Action handlers
-        self.action_handlers = {
+        # Numeric field values of the frame being evaluated, coerced once for all rules
+        self._numeric_frame: Optional[Mapping[str, Any]] = None
+        self._numeric_values: Dict[str, Optional[Union[int, float]]] = {}
+        
+        # Frame skipping: fields enabled rules read, and when the last rule scan must be repeated
+        self._watched_fields: frozenset = frozenset()
+        self._scan_next_frame = True  # Set after a match or a reload
+        self._recheck_at = float("-inf")  # _now() at which a time gate could next open
+        
+        # inotify watch on the rules directory, started from the first reload check
+        self._rules_inotify = None
+        self._rules_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._rules_watch_started = False
+        self._rules_dirty = False
+        
+        # Action handlers, indexed by _ACTION_IDS
+        handlers = {
             ActionType.SWITCH_SCENE: self._handle_switch_scene,
             ActionType.BREAKOUT_SEQUENCE: self._handle_breakout_sequence,
             ActionType.CAMERA_ROTATION: self._handle_camera_rotation,
@@ -101,6 +242,15 @@ class SceneEngineAdvanced:
             ActionType.PARALLEL: self._handle_parallel,
             ActionType.SEQUENCE: self._handle_sequence
         }
+        self.action_handlers = tuple(handlers[action_type] for action_type in ActionType)
+        
+        # Script globals shared by every custom script run
+        self._script_globals = {
+            'scene_engine': self,
+            'logger': self.logger,
+            'asyncio': asyncio,
+            'time': time,
+        }
         
         # Load initial rules
         self.load_scene_rules()
@@ -112,31 +262,31 @@ class SceneEngineAdvanced:
                 self.logger.info(f"Rules file not found, creating default: {self.rules_file}")
                 self._create_default_rules()
                 
-            with open(self.rules_file, 'r') as f:
-                rules_config = json.load(f)
+            rules_config = _json_loads(self.rules_file.read_bytes())
                 
-            # Parse rules into SceneRule objects
-            self.rules = []
+            # Parse rules into SceneRule objects; the live rules are swapped only once all parse
+            rules = []
+            self._regex_cache.clear()
             for rule_data in rules_config.get('rules', []):
-                rule = SceneRule(
-                    name=rule_data['name'],
-                    priority=rule_data.get('priority', 50),
-                    conditions=rule_data.get('conditions', []),
-                    actions=rule_data.get('actions', []),
-                    min_duration=rule_data.get('min_duration', 0),
-                    max_duration=rule_data.get('max_duration', 0),
-                    cooldown=rule_data.get('cooldown', 0),
-                    enabled=rule_data.get('enabled', True),
-                    description=rule_data.get('description', '')
-                )
-                self.rules.append(rule)
+                rule = SceneRule.from_dict(rule_data)
+                try:
+                    self._resolve_actions(rule.actions, rule.name)
+                except SyntaxError as e:
+                    self.logger.error(f"Rejecting rule {rule.name}: custom script does not compile: {e}")
+                    continue
+                rules.append(rule)
                 
                 # Initialize metrics
                 if rule.name not in self.rule_metrics:
                     self.rule_metrics[rule.name] = RuleExecutionMetrics(rule.name)
                     
             # Sort by priority (higher first)
-            self.rules.sort(key=lambda r: r.priority, reverse=True)
+            rules.sort(key=lambda r: r.priority, reverse=True)
+            self.rules = rules
+            self._watched_fields = frozenset(
+                c.get('field') for rule in rules if rule.enabled for c in rule.conditions
+            )
+            self._scan_next_frame = True
             
             self.last_rules_reload = time.time()
             self.logger.info(f"Loaded {len(self.rules)} scene rules")
@@ -292,11 +442,21 @@ class SceneEngineAdvanced:
         # Ensure directory exists
         self.rules_file.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(self.rules_file, 'w') as f:
-            json.dump(default_config, f, indent=4)
+        self.rules_file.write_bytes(_json_dumps_pretty(default_config))
             
     def check_rules_reload(self):
-        """Check if rules file has been modified and reload if necessary."""
+        """Check if rules file has been modified and reload if necessary.
+        
+        With an inotify watch in place the file is only stat()ed after an event
+        names it; otherwise it is checked on every call.
+        """
+        if not self._rules_watch_started:
+            self._start_rules_watch()
+        elif self._rules_inotify is not None:
+            if not self._rules_dirty:
+                return
+            self._rules_dirty = False
+            
         try:
             if self.rules_file.exists():
                 file_mtime = self.rules_file.stat().st_mtime
@@ -306,7 +466,59 @@ class SceneEngineAdvanced:
         except Exception as e:
             self.logger.error(f"Error checking rules file: {e}")
             
-    def evaluate_condition(self, condition: Dict[str, Any], current_data: Dict[str, Any]) -> bool:
+    def _start_rules_watch(self):
+        """Watch the rules file's directory with inotify, if available."""
+        self._rules_watch_started = True
+        if INotify is None:
+            return
+            
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._rules_watch_started = False  # Retry once called from the event loop
+            return
+            
+        try:
+            inotify = INotify()
+        except OSError as e:
+            self.logger.warning(f"inotify unavailable, polling rules file: {e}")
+            return
+            
+        try:
+            # Editors often save by renaming a temp file over the original
+            mask = inotify_flags.CLOSE_WRITE | inotify_flags.MOVED_TO | inotify_flags.CREATE
+            inotify.add_watch(str(self.rules_file.parent), mask)
+        except OSError as e:
+            inotify.close()
+            self.logger.warning(f"Cannot watch {self.rules_file.parent}, polling rules file: {e}")
+            return
+            
+        loop.add_reader(inotify.fileno(), self._drain_rules_events)
+        self._rules_inotify = inotify
+        self._rules_loop = loop
+        
+    def _drain_rules_events(self):
+        """Flag a reload when an inotify event names the rules file."""
+        if any(event.name == self.rules_file.name for event in self._rules_inotify.read(timeout=0)):
+            self._rules_dirty = True
+            
+    def close(self):
+        """Stop the rules file watch."""
+        if self._rules_inotify is not None:
+            self._rules_loop.remove_reader(self._rules_inotify.fileno())
+            self._rules_inotify.close()
+            self._rules_inotify = None
+            self._rules_loop = None
+        self._rules_watch_started = False
+        
+    async def __aenter__(self):
+        return self
+        
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+        
+    def evaluate_condition(self, condition: Dict[str, Any], current_data: Mapping[str, Any]) -> bool:
         """Evaluate a single condition with enhanced operators."""
         field = condition.get('field')
         operator = condition.get('operator')
@@ -317,37 +529,25 @@ class SceneEngineAdvanced:
             
         actual_value = current_data[field]
         
+        handler = _OPS.get(operator)
+        if handler is None:
+            self.logger.warning(f"Unknown operator: {operator}")
+            return False
+            
         try:
-            if operator == "==":
-                return self._compare_values(actual_value, expected_value, "==")
-            elif operator == "!=":
-                return self._compare_values(actual_value, expected_value, "!=")
-            elif operator == ">":
-                return float(actual_value) > float(expected_value)
-            elif operator == ">=":
-                return float(actual_value) >= float(expected_value)
-            elif operator == "<":
-                return float(actual_value) < float(expected_value)
-            elif operator == "<=":
-                return float(actual_value) <= float(expected_value)
-            elif operator == "contains":
-                return str(expected_value).lower() in str(actual_value).lower()
-            elif operator == "regex":
-                return bool(re.search(str(expected_value), str(actual_value)))
-            elif operator == "in":
-                return actual_value in expected_value
-            elif operator == "changed":
-                return self._check_value_changed(field, condition.get('from_value'))
-            elif operator == "stable_for":
-                return self._check_value_stable(field, expected_value)
-            else:
-                self.logger.warning(f"Unknown operator: {operator}")
-                return False
-                
+            return handler(self, field, actual_value, expected_value, condition)
         except Exception as e:
             self.logger.debug(f"Condition evaluation error: {e}")
             return False
             
+    def _regex_search(self, pattern: Any, value: Any) -> bool:
+        """Search value with a regex pattern, compiling each pattern only once."""
+        pattern = str(pattern)
+        compiled = self._regex_cache.get(pattern)
+        if compiled is None:
+            compiled = self._regex_cache[pattern] = re.compile(pattern)
+        return compiled.search(str(value)) is not None
+        
     def _compare_values(self, actual: Any, expected: Any, operator: str) -> bool:
         """Smart value comparison handling different types."""
         # Try numeric comparison first
@@ -390,59 +590,92 @@ class SceneEngineAdvanced:
             
     def _check_value_stable(self, field: str, duration: float) -> bool:
         """Check if a field has been stable for a given duration."""
-        if field not in self.data_history:
+        last_change = self._last_change_ts.get(field)
+        if last_change is None:
             return False
             
-        history = self.data_history[field]
-        if not history:
-            return False
-            
-        current_time = time.time()
-        current_value = history[-1]['value']
+        return _now() - last_change >= duration
         
-        # Check if value has been the same for the required duration
-        for entry in reversed(history):
-            if entry['value'] != current_value:
-                return False
-            if current_time - entry['timestamp'] >= duration:
-                return True
-                
-        return False
+    def update_data_history(self, data: Mapping[str, Any]) -> set:
+        """Update historical data for change detection.
         
-    def update_data_history(self, data: Dict[str, Any]):
-        """Update historical data for change detection."""
-        current_time = time.time()
+        Returns the fields whose value differs from the previous frame, plus
+        fields that appeared in or dropped out of this frame.
+        """
+        current_time = _now()
+        
+        # A field that went missing and came back with its old value still changes
+        # what conditions see, even though its history looks unchanged
+        fields = frozenset(data)
+        changed = set(fields.symmetric_difference(self._frame_fields))
+        self._frame_fields = fields
         
         for field, value in data.items():
-            if field not in self.data_history:
-                self.data_history[field] = []
+            history = self.data_history.get(field)
+            if history is None:
+                # 'changed' only compares the last two values
+                history = self.data_history[field] = deque(maxlen=2)
                 
-            history = self.data_history[field]
-            
-            # Add new entry
+            # Track when the value last changed, for 'stable_for'
+            if not history or history[-1]['value'] != value:
+                self._last_change_ts[field] = current_time
+                changed.add(field)
+                
+            # Add new entry; the deque drops the oldest
             history.append({
                 'value': value,
                 'timestamp': current_time
             })
             
-            # Keep only last 100 entries per field
-            if len(history) > 100:
-                history.pop(0)
+        return changed
+        
+    def _next_time_gate(self, now: float) -> float:
+        """Earliest future time at which a time-based gate could let a rule match.
+        
+        Covers cooldown expiry, min_duration, max_duration and stable_for; past
+        that point an unchanged frame may match where the last one did not.
+        """
+        since_scene = self._scene_changed_at
+        deadline = float("inf")
+        
+        for rule in self.rules:
+            if not rule.enabled:
+                continue
                 
-    def evaluate_rule(self, rule: SceneRule, current_data: Dict[str, Any]) -> bool:
+            gates = [since_scene + rule.min_duration]
+            if rule.max_duration > 0:
+                gates.append(since_scene + rule.max_duration)
+            last_run = self._rule_last_run.get(rule.name)
+            if last_run is not None:
+                gates.append(last_run + rule.cooldown)
+            for condition in rule.conditions:
+                if condition.get('operator') == "stable_for":
+                    last_change = self._last_change_ts.get(condition.get('field'))
+                    try:
+                        gates.append(last_change + float(condition.get('value')))
+                    except (TypeError, ValueError):
+                        pass  # Never stable - the condition cannot match
+                        
+            for gate in gates:
+                if now <= gate < deadline:
+                    deadline = gate
+                    
+        return deadline
+        
+    def evaluate_rule(self, rule: SceneRule, current_data: Mapping[str, Any]) -> bool:
         """Evaluate if a rule should trigger."""
         if not rule.enabled:
             return False
             
         # Check cooldown
-        metrics = self.rule_metrics.get(rule.name)
-        if metrics and metrics.last_executed > 0:
-            time_since_last = time.time() - metrics.last_executed
+        last_run = self._rule_last_run.get(rule.name)
+        if last_run is not None:
+            time_since_last = _now() - last_run
             if time_since_last < rule.cooldown:
                 return False
                 
         # Check minimum duration since last scene change
-        time_since_scene_change = time.time() - self.last_scene_change
+        time_since_scene_change = _now() - self._scene_changed_at
         if time_since_scene_change < rule.min_duration:
             return False
             
@@ -450,13 +683,47 @@ class SceneEngineAdvanced:
         if rule.max_duration > 0 and time_since_scene_change > rule.max_duration:
             return True  # Force trigger
             
-        # Evaluate all conditions (AND logic)
-        for condition in rule.conditions:
+        # Evaluate all conditions (AND logic), numeric ones inline on pre-coerced values
+        for field, op_code, bound, condition in rule.compiled_conditions:
+            if op_code >= 0 and field in current_data:
+                actual = self._numeric_value(field, current_data)
+                if actual is not None:
+                    if not _num_cmp(op_code, actual, bound):
+                        return False
+                    continue
+                # Non-numeric actual value - '=='/'!=' fall back to string comparison
+                
             if not self.evaluate_condition(condition, current_data):
                 return False
                 
         return True
         
+    def _numeric_value(self, field: str, current_data: Mapping[str, Any]) -> Optional[Union[int, float]]:
+        """Float value of a frame field, or None if it is not numeric.
+        
+        Each field is coerced once per frame and shared by every rule reading it.
+        """
+        if current_data is not self._numeric_frame:
+            self._numeric_frame = current_data
+            self._numeric_values = {}
+            
+        values = self._numeric_values
+        try:
+            return values[field]
+        except KeyError:
+            pass
+            
+        # Scoreboard numbers usually arrive as int or float already; only coerce the rest
+        value = current_data[field]
+        value_type = type(value)
+        if value_type is not float and value_type is not int:
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                value = None
+        values[field] = value
+        return value
+        
     async def process_scoreboard_data(self, data: Dict[str, Any]):
         """Process new scoreboard data and execute matching rules."""
         # Hot-reload rules if changed
@@ -466,35 +733,50 @@ class SceneEngineAdvanced:
         enhanced_data = self._enhance_data(data)
         
         # Update history for change detection
-        self.update_data_history(enhanced_data)
+        changed_fields = self.update_data_history(enhanced_data)
         
-        # Find matching rules
-        matching_rules = []
-        for rule in self.rules:
-            if self.evaluate_rule(rule, enhanced_data):
-                matching_rules.append(rule)
-                
-        if not matching_rules:
+        # Skip the scan when it would repeat the last "no match": nothing a rule reads
+        # changed and no cooldown, duration or stable_for gate has opened since
+        now = _now()
+        if (not self._scan_next_frame and now < self._recheck_at
+                and changed_fields.isdisjoint(self._watched_fields)):
             return
             
-        # Execute highest priority rule
-        selected_rule = matching_rules[0]
+        # Rules are sorted by priority, so the first match is the one to execute
+        if self.config.get('debug_mode'):
+            matching_rules = [rule for rule in self.rules if self.evaluate_rule(rule, enhanced_data)]
+            if matching_rules:
+                self.logger.debug(f"Matching rules: {[rule.name for rule in matching_rules]}")
+            selected_rule = matching_rules[0] if matching_rules else None
+        else:
+            selected_rule = next((rule for rule in self.rules if self.evaluate_rule(rule, enhanced_data)), None)
+            
+        if selected_rule is None:
+            self._scan_next_frame = False
+            self._recheck_at = self._next_time_gate(now)
+            return
+            
+        # A match can repeat on identical data, so scan the next frame too
+        self._scan_next_frame = True
         
+        # Execute highest priority rule
         self.logger.info(f"Executing scene rule: {selected_rule.name} (priority: {selected_rule.priority})")
         
         # Track metrics
         metrics = self.rule_metrics[selected_rule.name]
-        execution_start = time.time()
+        execution_start = _now()
         
         try:
             # Execute all actions in the rule
             await self._execute_rule_actions(selected_rule, enhanced_data)
             
             # Update success metrics
-            execution_time = time.time() - execution_start
+            finished = _now()
+            execution_time = finished - execution_start
             metrics.execution_count += 1
             metrics.success_count += 1
             metrics.last_executed = time.time()
+            self._rule_last_run[selected_rule.name] = finished
             metrics.total_execution_time += execution_time
             metrics.average_execution_time = metrics.total_execution_time / metrics.execution_count
             
@@ -502,42 +784,97 @@ class SceneEngineAdvanced:
             self.logger.error(f"Rule execution failed for {selected_rule.name}: {e}")
             metrics.failure_count += 1
             
-    def _enhance_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Add derived fields to scoreboard data."""
-        enhanced = data.copy()
+    def _enhance_data(self, data: Dict[str, Any]) -> Mapping[str, Any]:
+        """Add derived fields to scoreboard data.
         
+        Derived fields live in a small overlay layered over the raw data with a
+        ChainMap, so the frame itself is never copied.
+        """
+        # Historical context only changes on a scene switch
+        if self._recent_scenes is None:
+            history = self.scene_history
+            self._recent_scenes = list(islice(history, max(0, len(history) - 5), None))
+            
         # Add current scene info
-        enhanced['current_scene'] = self.current_scene
-        enhanced['time_in_current_scene'] = time.time() - self.last_scene_change
-        
-        # Add historical context
-        enhanced['scene_history'] = self.scene_history[-5:]  # Last 5 scenes
+        overlay = {
+            'current_scene': self.current_scene,
+            'time_in_current_scene': _now() - self._scene_changed_at,
+            'scene_history': self._recent_scenes,
+        }
         
         # Detect game state changes
         game_time = data.get('game_time', 0)
         if hasattr(self, '_last_game_time'):
-            enhanced['game_time_changed'] = game_time != self._last_game_time
-            enhanced['game_started'] = self._last_game_time == 0 and game_time > 0
-            enhanced['game_ended'] = self._last_game_time > 0 and game_time == 0
+            overlay['game_time_changed'] = game_time != self._last_game_time
+            overlay['game_started'] = self._last_game_time == 0 and game_time > 0
+            overlay['game_ended'] = self._last_game_time > 0 and game_time == 0
         else:
-            enhanced['game_time_changed'] = False
-            enhanced['game_started'] = False
-            enhanced['game_ended'] = False
+            overlay['game_time_changed'] = False
+            overlay['game_started'] = False
+            overlay['game_ended'] = False
             
         self._last_game_time = game_time
         
-        return enhanced
+        return ChainMap(overlay, data)
         
     async def _execute_rule_actions(self, rule: SceneRule, data: Dict[str, Any]):
         """Execute all actions for a rule."""
         for action in rule.actions:
-            action_type = ActionType(action.get('type'))
+            await self._action_handler(action)(action, data)
+            
+    def _resolve_actions(self, actions: List[Dict[str, Any]], rule_name: str):
+        """Resolve action types, handlers and script code once at load, recursing into nested actions."""
+        for action in actions:
+            try:
+                action_type = ActionType(action.get('type'))
+            except ValueError:
+                self.logger.warning(f"Unknown action type in rule {rule_name}: {action.get('type')}")
+                action_type = None
+                
+            _intern_keys(action, 'scene', 'return_to_scene')
+            action['_type'] = action_type
+            action['_handler'] = self.action_handlers[_ACTION_IDS[action_type]] if action_type is not None else None
             
-            if action_type in self.action_handlers:
-                await self.action_handlers[action_type](action, data)
-            else:
-                self.logger.warning(f"Unknown action type: {action_type}")
+            # Compile custom scripts once; a SyntaxError rejects the rule
+            if action_type is ActionType.CUSTOM_SCRIPT and action.get('script'):
+                action['_code'] = compile(action['script'], f"<rule:{rule_name}>", 'exec')
+                
+            if action_type in (ActionType.PARALLEL, ActionType.SEQUENCE):
+                self._resolve_actions(action.get('actions', []), rule_name)
+                
+            if action_type is ActionType.SEQUENCE:
+                action['_steps'] = self._fold_delays(action.get('actions', []))
                 
+    def _fold_delays(self, actions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Merge runs of consecutive numeric delays into a single delay step.
+        
+        Back-to-back sleeps take the same total time as one sleep of their sum,
+        which saves an event loop wakeup per extra delay.
+        """
+        steps: List[Dict[str, Any]] = []
+        for action in actions:
+            if action.get('_type') is ActionType.DELAY:
+                duration = action.get('duration', 1.0)
+                previous = steps[-1] if steps else None
+                if (type(duration) in (int, float) and previous is not None
+                        and previous.get('_type') is ActionType.DELAY
+                        and type(previous.get('duration', 1.0)) in (int, float)):
+                    steps[-1] = dict(previous, duration=previous.get('duration', 1.0) + duration)
+                    continue
+            steps.append(action)
+        return steps
+        
+    def _action_handler(self, action: Dict[str, Any]) -> Callable:
+        """Get the handler resolved for an action at load (unresolved actions are looked up now)."""
+        try:
+            handler = action['_handler']
+        except KeyError:
+            handler = self.action_handlers[_ACTION_IDS[ActionType(action.get('type'))]]
+            
+        if handler is None:
+            raise ValueError(f"Unknown action type: {action.get('type')}")
+        return handler
+        
     async def _handle_switch_scene(self, action: Dict[str, Any], data: Dict[str, Any]):
         """Handle scene switch action."""
         scene_name = action.get('scene')
@@ -602,18 +939,16 @@ class SceneEngineAdvanced:
         self.logger.info("Executing custom scene script")
         
         try:
-            # Safe execution environment
-            safe_globals = {
-                'scene_engine': self,
-                'data': data,
-                'logger': self.logger,
-                'asyncio': asyncio,
-                'time': time,
-                'switch_scene': lambda scene: self._handle_switch_scene({'scene': scene}, data)
-            }
+            # Safe execution environment, copied so scripts cannot leak names into each other
+            safe_globals = self._script_globals.copy()
+            safe_globals['data'] = data
+            safe_globals['switch_scene'] = lambda scene: self._handle_switch_scene({'scene': scene}, data)
             
-            # Execute script
-            exec(script, safe_globals)
+            # Execute script, compiled at rule load
+            code = action.get('_code')
+            if code is None:
+                code = compile(script, "<custom_script>", 'exec')
+            exec(code, safe_globals)
             
         except Exception as e:
             self.logger.error(f"Custom script execution failed: {e}")
@@ -629,49 +964,51 @@ class SceneEngineAdvanced:
         
         tasks = []
         for sub_action in sub_actions:
-            action_type = ActionType(sub_action.get('type'))
-            if action_type in self.action_handlers:
-                task = asyncio.create_task(self.action_handlers[action_type](sub_action, data))
-                tasks.append(task)
+            task = asyncio.create_task(self._action_handler(sub_action)(sub_action, data))
+            tasks.append(task)
                 
         await asyncio.gather(*tasks, return_exceptions=True)
         
     async def _handle_sequence(self, action: Dict[str, Any], data: Dict[str, Any]):
         """Handle sequential action execution."""
-        sub_actions = action.get('actions', [])
+        sub_actions = action.get('_steps')
+        if sub_actions is None:
+            sub_actions = action.get('actions', [])
         
         for sub_action in sub_actions:
-            action_type = ActionType(sub_action.get('type'))
-            if action_type in self.action_handlers:
-                await self.action_handlers[action_type](sub_action, data)
+            await self._action_handler(sub_action)(sub_action, data)
                 
     def _update_scene_state(self, scene_name: str):
         """Update internal scene state tracking."""
         if scene_name != self.current_scene:
-            # Add to history
+            # Add to history (the deque keeps only the last 20 scenes)
             self.scene_history.append({
                 'scene': self.current_scene,
-                'duration': time.time() - self.last_scene_change,
+                'duration': self._reported_time_in_scene(),
                 'timestamp': self.last_scene_change
             })
             
-            # Keep only last 20 scenes in history
-            if len(self.scene_history) > 20:
-                self.scene_history.pop(0)
-                
+            self._recent_scenes = None
+            
             self.current_scene = scene_name
             self.last_scene_change = time.time()
+            self._scene_changed_at = _now()
             
+    def _reported_time_in_scene(self) -> float:
+        """Seconds in the current scene for history and metrics; 0 before the first switch."""
+        elapsed = _now() - self._scene_changed_at
+        return elapsed if elapsed != float("inf") else 0.0
+        
     def get_metrics(self) -> Dict[str, Any]:
         """Get comprehensive scene engine metrics."""
         return {
             'current_scene': self.current_scene,
-            'time_in_scene': time.time() - self.last_scene_change,
+            'time_in_scene': self._reported_time_in_scene(),
             'total_rules': len(self.rules),
             'enabled_rules': len([r for r in self.rules if r.enabled]),
             'scene_changes': len(self.scene_history),
-            'rule_metrics': {name: asdict(metrics) for name, metrics in self.rule_metrics.items()},
-            'recent_scene_history': self.scene_history[-10:]
+            'rule_metrics': {name: metrics.to_dict() for name, metrics in self.rule_metrics.items()},
+            'recent_scene_history': list(islice(self.scene_history, max(0, len(self.scene_history) - 10), None))
         }
         
     def get_rule_status(self) -> List[Dict[str, Any]]:
@@ -750,8 +1087,7 @@ def create_example_rules_config():
         ]
     }
     
-    with open('/tmp/example_scene_rules.json', 'w') as f:
-        json.dump(example_config, f, indent=4)
+    Path('/tmp/example_scene_rules.json').write_bytes(_json_dumps_pretty(example_config))
         
     print("Example rules created at /tmp/example_scene_rules.json")
 
@@ -779,20 +1115,20 @@ if __name__ == "__main__":
         async def set_current_scene(self, scene_name):
             print(f"Mock: Switching to scene {scene_name}")
     
-    engine = SceneEngineAdvanced(config, MockOBSClient(), logger)
-    
     # Test with sample data
     async def test_engine():
-        # Simulate game start
-        await engine.process_scoreboard_data({
-            'game_time': 120,
-            'break_time': 0,
-            'team_a_score': 0,
-            'team_b_score': 0
-        })
-        
-        # Show metrics
-        print("\nEngine Metrics:")
-        print(json.dumps(engine.get_metrics(), indent=2))
+        # The context manager closes the rules file watch on the way out
+        async with SceneEngineAdvanced(config, MockOBSClient(), logger) as engine:
+            # Simulate game start
+            await engine.process_scoreboard_data({
+                'game_time': 120,
+                'break_time': 0,
+                'team_a_score': 0,
+                'team_b_score': 0
+            })
+            
+            # Show metrics
+            print("\nEngine Metrics:")
+            print(_json_dumps_pretty(engine.get_metrics()).decode())
     
     asyncio.run(test_engine())
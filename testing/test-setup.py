@@ -1,217 +1,534 @@
-#!/usr/bin/env bash
-set -e
-out="/tmp/roc_deep_test_suite"
-rm -rf "$out"
-mkdir -p "$out"
-
-cat > "$out/conftest.py" <<'PY'
-import os, tempfile, json, pathlib, pytest
+#!/usr/bin/env python3
+"""Generate the ROC deep test suite under /tmp and pack it into a zip."""
+import shutil, zipfile
 from pathlib import Path
 
+OUT = Path("/tmp/roc_deep_test_suite")
+
+CONFTEST = b'''\
+import asyncio, hashlib, importlib, os, tempfile, pathlib, pytest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = lambda o: orjson.dumps(o, option=orjson.OPT_INDENT_2)
+except ImportError:  # stdlib fallback
+    import json
+    _loads = json.loads
+    _dumps = lambda o: json.dumps(o, indent=2).encode()
+try:
+    import msgspec
+except ImportError:  # loaders return plain dicts
+    msgspec = None
+
+if msgspec is not None:
+    class Rule(msgspec.Struct):
+        name: str
+        priority: int = 0
+        conditions: list = []
+        actions: list = []
+
+    class Config(msgspec.Struct):
+        obs: dict
+        cameras: list = []
+        debug_mode: bool = False
+
+    _rules_decoder = msgspec.json.Decoder(List[Rule])
+    _config_decoder = msgspec.json.Decoder(Config)
+
+    def load_rules(path):
+        return _rules_decoder.decode(Path(path).read_bytes())
+
+    def load_config(path):
+        return _config_decoder.decode(Path(path).read_bytes())
+else:
+    def load_rules(path):
+        return _loads(Path(path).read_bytes())
+
+    def load_config(path):
+        return _loads(Path(path).read_bytes())
+
+def _config_dir_valid(etc):
+    try:
+        load_config(etc / "config.json")
+        load_rules(etc / "scene_rules.json")
+    except Exception:  # missing, truncated or schema-invalid cached files
+        return False
+    return True
+
+def _write_config_dir(etc, files):
+    etc.mkdir(parents=True, exist_ok=True)
+    for name, payload in files:
+        tmp = etc / f".{name}.{os.getpid()}"
+        tmp.write_bytes(payload)
+        os.replace(tmp, etc / name)
+    # Round-trip through the typed loaders so schema drift fails here, not deep in a test.
+    load_config(etc / "config.json")
+    load_rules(etc / "scene_rules.json")
+
 @pytest.fixture(scope="session")
 def safe_config_dir(tmp_path_factory):
-    d = tmp_path_factory.mktemp("roc_safe_etc")
-    etc = d / "etc" / "roc"
-    etc.mkdir(parents=True)
     cfg = {
         "obs": {"host": "127.0.0.1", "port": 4455, "password": "changeme"},
         "cameras": [],
         "debug_mode": True
     }
-    (etc / "config.json").write_text(json.dumps(cfg, indent=2))
     scene_rules = [{"name":"always","priority":10,"conditions":[],"actions":[{"type":"noop"}]}]
-    (etc / "scene_rules.json").write_text(json.dumps(scene_rules, indent=2))
+    files = (("config.json", _dumps(cfg)), ("scene_rules.json", _dumps(scene_rules)))
+    digest = hashlib.sha256(b"".join(payload for _, payload in files)).hexdigest()[:16]
+    # Identical content is shared across sessions and xdist workers: one writer, the rest just read.
+    cache_home = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    etc = cache_home / "roc-tests" / digest
+    try:
+        if not _config_dir_valid(etc):
+            _write_config_dir(etc, files)
+    except OSError:
+        etc = tmp_path_factory.mktemp("roc_safe_etc") / "etc" / "roc"
+        _write_config_dir(etc, files)
     os.environ["ROC_CONFIG_DIR"] = str(etc)
     return str(etc)
-PY
 
-cat > "$out/tests_test_scene_engine.py" <<'PY'
-import importlib, inspect, json, os, pytest
+@pytest.fixture(scope="session")
+def scene_engine_module():
+    try:
+        return importlib.import_module("roc_scene_engine")
+    except Exception as e:
+        pytest.skip(f"roc_scene_engine not importable: {e}")
+
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    # Async tests share one session loop; run it on uvloop when available.
+    try:
+        import uvloop
+        return uvloop.EventLoopPolicy()
+    except ImportError:
+        return asyncio.DefaultEventLoopPolicy()
+
+def _safe_import(name):
+    try:
+        return importlib.import_module(name)
+    except Exception:
+        return None
+
+@pytest.fixture(scope="session")
+def loaded_modules():
+    names = ("roc_main", "roc_scene_engine", "roc_bootstrap")
+    # Imports are mostly file reads and bytecode loads; overlap them.
+    with ThreadPoolExecutor(max_workers=len(names)) as ex:
+        return dict(zip(names, ex.map(_safe_import, names)))
+'''
+
+TEST_SCENE_ENGINE = b'''\
+import asyncio, functools, json, logging, os, re, pytest
 from pathlib import Path
+try:
+    from orjson import loads as _loads
+except ImportError:  # stdlib fallback
+    from json import loads as _loads
+
+_SCENE_ENGINE_RX = re.compile(r"Scene|Engine")
+
+@functools.lru_cache(maxsize=None)
+def _module_names(module):
+    return tuple(dir(module))
+
+@functools.lru_cache(maxsize=None)
+def _candidate_rx(candidates):
+    return re.compile("|".join(map(re.escape, candidates)), re.I)
 
 def _find_symbol(module, candidates):
-    for name in dir(module):
-        for c in candidates:
-            if c.lower() in name.lower():
-                return name
-    return None
+    rx = _candidate_rx(tuple(candidates))
+    return next((name for name in _module_names(module) if rx.search(name)), None)
 
-def test_scene_engine_basic_import():
-    try:
-        m = importlib.import_module("roc_scene_engine")
-    except Exception as e:
-        pytest.skip(f"roc_scene_engine not importable: {e}")
+_METHODS = ("evaluate", "choose", "apply_rules", "process")
+
+def _find_method(obj):
+    # Look names up in the MRO dicts instead of hasattr(), which runs descriptors.
+    cls = obj if isinstance(obj, type) else type(obj)
+    names = set(getattr(obj, "__dict__", ()))
+    for k in cls.__mro__:
+        names.update(k.__dict__)
+    return next((meth for meth in _METHODS if meth in names), None)
+
+def _required_args(cls):
+    # Positional parameters __init__ needs beyond self; C-level inits count as zero.
+    init = cls.__init__
+    code = getattr(init, "__code__", None)
+    if code is None:
+        return 0
+    return code.co_argcount - len(init.__defaults__ or ()) - 1
+
+def test_scene_engine_basic_import(scene_engine_module):
+    m = scene_engine_module
     candidates = ["SceneEngine", "Scene", "Engine", "Rule", "parse_rules", "load_rules"]
     sym = _find_symbol(m, candidates)
     assert sym is not None, "No Scene/Engine/Rule/parse function found in roc_scene_engine; manual inspection needed"
     attr = getattr(m, sym)
-    if inspect.isclass(attr):
+    if isinstance(attr, type):
+        argc = _required_args(attr)
+        if argc > 1:
+            pytest.skip(f"Could not instantiate {sym} with common signatures")
         try:
-            inst = None
-            try:
-                inst = attr()
-            except TypeError:
-                try:
-                    inst = attr([])
-                except Exception:
-                    pytest.skip(f"Could not instantiate {sym} with common signatures")
-            for meth in ("evaluate", "choose", "apply_rules", "process"):
-                if hasattr(inst, meth):
-                    return
-            assert inst is not None
+            attr() if argc == 0 else attr([])
         except Exception as e:
             pytest.skip(f"Instantiation of {sym} failed: {e}")
-    else:
-        if callable(attr):
-            try:
-                cfg_dir = os.environ.get("ROC_CONFIG_DIR") or "/etc/roc"
-                rules_file = Path(cfg_dir) / "scene_rules.json"
-                if rules_file.exists():
-                    rules = json.loads(rules_file.read_text())
-                else:
-                    rules = []
-                try:
-                    r = attr(rules)
-                except TypeError:
-                    r = attr()
-                assert r is not None or r == None
-            except Exception as e:
-                pytest.skip(f"Calling parser function failed: {e}")
-        else:
-            pytest.skip("Found symbol is not callable and not a class")
-
-def test_scene_engine_rule_evaluation_smoke():
+        return
+    if not callable(attr):
+        pytest.skip("Found symbol is not callable and not a class")
+    # Passing means the parser ran without raising; its return value is not checked.
     try:
-        m = importlib.import_module("roc_scene_engine")
+        cfg_dir = os.environ.get("ROC_CONFIG_DIR") or "/etc/roc"
+        rules_file = Path(cfg_dir) / "scene_rules.json"
+        if rules_file.exists():
+            rules = _loads(rules_file.read_bytes())
+        else:
+            rules = []
+        try:
+            attr(rules)
+        except TypeError:
+            attr()
     except Exception as e:
-        pytest.skip(f"roc_scene_engine not importable: {e}")
+        pytest.skip(f"Calling parser function failed: {e}")
+
+def test_scene_engine_rule_evaluation_smoke(scene_engine_module):
+    m = scene_engine_module
     candidates = ["evaluate", "choose", "select", "apply", "process"]
-    sym = None
-    for c in candidates:
-        if hasattr(m, c):
-            sym = getattr(m, c)
-            break
+    mdict = vars(m)
+    sym = next((mdict[c] for c in candidates if c in mdict), None)
     if sym is None:
-        names = [n for n in dir(m) if "Scene" in n or "Engine" in n]
+        names = [n for n in _module_names(m) if _SCENE_ENGINE_RX.search(n)]
         for n in names:
             obj = getattr(m, n)
-            if inspect.isclass(obj):
-                for meth in ("evaluate", "choose", "apply_rules", "process"):
-                    if hasattr(obj, meth):
-                        sym = getattr(obj, meth)
-                        break
+            if isinstance(obj, type):
+                meth = _find_method(obj)
+                if meth:
+                    sym = getattr(obj, meth)
             if sym: break
     if sym is None:
         pytest.skip("No evaluation function/method found; nothing to run")
     try:
-        result = sym({"game_time": 0, "timeout_active": False})
-        assert True
+        sym({"game_time": 0, "timeout_active": False})
     except TypeError:
         pytest.skip("Evaluation callable requires different signature; manual test needed")
-    except Exception as e:
-        assert True
-PY
+    except Exception:
+        pass  # reaching the callable is the smoke check; domain errors are fine
+
+# Behaviour tests for SceneEngineAdvanced: a recording OBS stub and a fake clock
+
+class _RecordingOBS:
+    def __init__(self):
+        self.scenes = []
+
+    async def set_current_scene(self, scene):
+        self.scenes.append(scene)
+
+@pytest.fixture
+def clock(scene_engine_module, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(scene_engine_module, "_now", lambda: now[0])
+    return now
+
+@pytest.fixture
+def make_engine(scene_engine_module, tmp_path):
+    engines = []
+    def make(rules):
+        rules_file = tmp_path / "scene_rules.json"
+        rules_file.write_text(json.dumps({"rules": rules}))
+        obs = _RecordingOBS()
+        engine = scene_engine_module.SceneEngineAdvanced(
+            {"scene_rules_file": str(rules_file)}, obs, logging.getLogger("roc-test-engine"))
+        engines.append(engine)
+        return engine, obs
+    yield make
+    for engine in engines:
+        engine.close()
+
+def _switch_rule(name, priority, conditions, scene, **extra):
+    return dict(name=name, priority=priority, conditions=conditions,
+                actions=[{"type": "switch_scene", "scene": scene}], **extra)
+
+async def _feed(engine, clock, frames, step=1.0):
+    for frame in frames:
+        clock[0] += step
+        await engine.process_scoreboard_data(frame)
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_field_returning_with_old_value_rescans_rules(make_engine, clock):
+    engine, obs = make_engine([
+        _switch_rule("a", 10, [{"field": "a", "operator": "==", "value": 1}], "A"),
+        _switch_rule("b", 5, [{"field": "b", "operator": "==", "value": 1}], "B"),
+    ])
+    # 'a' drops out, a frame matches nothing, then 'a' returns with its old value
+    await _feed(engine, clock, [{"a": 1}, {"b": 1}, {}, {"a": 1}])
+    assert obs.scenes == ["A", "B", "A"]
 
-cat > "$out/obs_mock_server.py" <<'PY'
+@pytest.mark.asyncio(loop_scope="session")
+async def test_cooldown_expiry_rescans_unchanged_frames(make_engine, clock):
+    engine, obs = make_engine([
+        _switch_rule("a", 10, [{"field": "x", "operator": "==", "value": 1}], "A", cooldown=5),
+        _switch_rule("b", 5, [{"field": "x", "operator": "==", "value": 1}], "B", cooldown=100),
+    ])
+    # 'a' fires, 'b' fills in during a's cooldown, then nothing matches until it expires
+    await _feed(engine, clock, [{"x": 1}] * 4)
+    assert obs.scenes == ["A", "B"]
+    await _feed(engine, clock, [{"x": 1}] * 3)
+    assert obs.scenes == ["A", "B", "A"]
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_sequence_folds_consecutive_delays(make_engine, clock, scene_engine_module, monkeypatch):
+    sleeps = []
+
+    class _RecordingAsyncio:
+        def __getattr__(self, name):
+            return getattr(asyncio, name)
+
+        async def sleep(self, delay):
+            sleeps.append(delay)
+    monkeypatch.setattr(scene_engine_module, "asyncio", _RecordingAsyncio())
+
+    engine, obs = make_engine([{
+        "name": "seq", "priority": 1,
+        "conditions": [{"field": "go", "operator": "==", "value": 1}],
+        "actions": [{"type": "sequence", "actions": [
+            {"type": "switch_scene", "scene": "A"},
+            {"type": "delay", "duration": 0.25},
+            {"type": "delay", "duration": 0.5},
+            {"type": "switch_scene", "scene": "B"},
+            {"type": "delay", "duration": 1},
+        ]}],
+    }])
+    await _feed(engine, clock, [{"go": 1}])
+    assert obs.scenes == ["A", "B"]
+    assert sleeps == [0.75, 1]
+'''
+
+OBS_MOCK_SERVER = b'''\
 """
 Simple OBS WebSocket mock server for pytest to use.
 This mock is intentionally minimal: it accepts websocket connections and responds to a small set
 of messages with predictable JSON. It's useful to test client code that attempts to connect to OBS.
 """
-import asyncio, json, websockets
+import asyncio, json, signal, websockets
+
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = lambda o: orjson.dumps(o).decode()
+except ImportError:  # stdlib fallback
+    _loads = json.loads
+    _dumps = json.dumps
+
+# Static replies are serialized once; sent as str so clients get text frames.
+_VERSION_REPLY = _dumps({"status":"ok","version":"5.0.0-mock"})
 
 async def handler(ws, path):
     try:
         async for msg in ws:
             try:
-                data = json.loads(msg)
+                data = _loads(msg)
                 if isinstance(data, dict) and data.get("request") == "GetVersion":
-                    await ws.send(json.dumps({"status":"ok","version":"5.0.0-mock"}))
+                    await ws.send(_VERSION_REPLY)
                 else:
-                    await ws.send(json.dumps({"status":"ok","echo": data}))
+                    await ws.send(_dumps({"status":"ok","echo": data}))
             except Exception:
-                await ws.send(json.dumps({"status":"ok","raw": str(msg)}))
+                await ws.send(_dumps({"status":"ok","raw": str(msg)}))
     except Exception:
         pass
 
 def make_server(host="127.0.0.1", port=4455):
-    return websockets.serve(handler, host, port)
+    # Replies are tiny: per-message deflate and keepalive pings only add overhead.
+    return websockets.serve(handler, host, port, compression=None, max_size=None, ping_interval=None)
+
+async def main(host, port):
+    loop = asyncio.get_running_loop()
+    stop = loop.create_future()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, lambda: stop.done() or stop.set_result(None))
+    async with make_server(host, port):
+        print("Mock OBS websocket server running on", host, port)
+        await stop
 
 if __name__ == "__main__":
     import sys
     host = sys.argv[1] if len(sys.argv)>1 else "127.0.0.1"
     port = int(sys.argv[2]) if len(sys.argv)>2 else 4455
-    loop = asyncio.get_event_loop()
-    srv = make_server(host, port)
-    server = loop.run_until_complete(srv)
-    print("Mock OBS websocket server running on", host, port)
     try:
-        loop.run_forever()
-    except KeyboardInterrupt:
-        server.close()
-        loop.run_until_complete(server.wait_closed())
-PY
-
-cat > "$out/tests_test_obs.py" <<'PY'
-import asyncio, importlib, pytest, subprocess, sys, time, os
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    asyncio.run(main(host, port))
+'''
+
+TEST_OBS = b'''\
+import asyncio, pytest, sys, time, os
 from pathlib import Path
 from obs_mock_server import make_server
 
-@pytest.mark.asyncio
-async def test_obs_mock_server_runs(event_loop, safe_config_dir):
-    server = await make_server("127.0.0.1", 4455)
+@pytest.mark.asyncio(loop_scope="session")
+async def test_obs_mock_server_runs(safe_config_dir):
     import websockets, json
     uri = "ws://127.0.0.1:4455"
-    async with websockets.connect(uri) as ws:
-        await ws.send(json.dumps({"request":"GetVersion"}))
-        resp = await ws.recv()
-        assert "version" in resp or "ok" in resp
-    server.close()
+    async with make_server("127.0.0.1", 4455):
+        async with websockets.connect(uri, compression=None, ping_interval=None) as ws:
+            await ws.send(json.dumps({"request":"GetVersion"}))
+            resp = await ws.recv()
+            assert "version" in resp or "ok" in resp
 
-def test_repo_client_connects_to_obs(safe_config_dir):
+def test_repo_client_connects_to_obs(safe_config_dir, loaded_modules):
     os.environ["ROC_OBS_HOST"] = "127.0.0.1"
     os.environ["ROC_OBS_PORT"] = "4455"
     names = ["roc_main", "roc_scene_engine", "roc_bootstrap"]
+    missing = [n for n in names if loaded_modules.get(n) is None]
+    assert not missing, f"Repo modules failed to import: {missing}"
     for n in names:
-        try:
-            m = importlib.import_module(n)
-        except Exception:
-            continue
+        m = loaded_modules[n]
         for attr in ("connect_obs", "obs_connect", "connect", "start"):
             if hasattr(m, attr):
-                cmd = [sys.executable, "-c", f"import {n}; print('OK')"]
-                p = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=8, text=True)
-                assert p.returncode == 0 or p.stdout.strip().startswith("OK")
-PY
+                assert callable(getattr(m, attr)), f"{n}.{attr} is not callable"
+                break
+'''
 
-cat > "$out/tests_test_ffmpeg.py" <<'PY'
-import importlib, pytest, shutil, os
+TEST_FFMPEG = b'''\
+import pytest, re, shutil, os
 from pathlib import Path
-def test_ffmpeg_builder_detected_and_runs():
+
+_FFMPEG_RX = re.compile(r"ffmpeg", re.I)
+
+def test_ffmpeg_builder_detected_and_runs(loaded_modules):
     names = ["roc_main", "roc_bootstrap", "roc_scene_engine"]
     found = False
     for n in names:
-        try:
-            m = importlib.import_module(n)
-        except Exception:
+        m = loaded_modules.get(n)
+        if m is None:
             continue
-        for attr in dir(m):
-            if "ffmpeg" in attr.lower():
-                found = True
-                fn = getattr(m, attr)
-                if callable(fn):
+        mdict = vars(m)
+        for attr in [a for a in mdict if _FFMPEG_RX.search(a)]:
+            found = True
+            fn = mdict[attr]
+            if callable(fn):
+                try:
                     try:
-                        try:
-                            res = fn({"input": "test", "output":"test"})
-                        except TypeError:
-                            res = fn()
-                        assert isinstance(res, (str, list))
-                    except Exception as e:
-                        pytest.skip(f"ffmpeg builder {attr} raised exception: {e}")
+                        res = fn({"input": "test", "output":"test"})
+                    except TypeError:
+                        res = fn()
+                    assert isinstance(res, (str, list))
+                except Exception as e:
+                    pytest.skip(f"ffmpeg builder {attr} raised exception: {e}")
+                return  # one working builder is enough
     assert found, "No ffmpeg builder function found in common modules"
-PY
+'''
+
+TEST_MAIN = b'''\
+import asyncio, logging, pytest
+
+def test_custom_code_sees_data_in_nested_scopes(loaded_modules):
+    m = loaded_modules.get("roc_main")
+    if m is None:
+        pytest.skip("roc_main not importable")
+    logger = logging.getLogger("roc-test-custom-code")
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    logger.addHandler(handler)
+    try:
+        engine = m.SceneEngine({}, logger)
+        data = {"home": 1, "away": 2}
+        code = "data['seen'] = [data[k] for k in data]"
+        asyncio.run(engine.execute_custom_code(code, data))
+    finally:
+        logger.removeHandler(handler)
+    assert data["seen"] == [1, 2]
+    assert not [r for r in records if r.levelno >= logging.ERROR]
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_only_higher_priority_actions_preempt(loaded_modules):
+    m = loaded_modules.get("roc_main")
+    if m is None:
+        pytest.skip("roc_main not importable")
+    engine = m.SceneEngine({}, logging.getLogger("roc-test-preempt"))
+    started, cancelled = [], []
+
+    async def dispatch(action, data):
+        started.append(action["name"])
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.append(action["name"])
+            raise
+    engine._dispatch_action = dispatch
 
-cat > "$out/README.md" <<'MD'
+    breakout, game, alert = {"name": "breakout"}, {"name": "game"}, {"name": "alert"}
+    try:
+        await engine.execute_action(breakout, {}, 150)
+        await asyncio.sleep(0)
+        await engine.execute_action(game, {}, 100)  # lower priority: ignored
+        await engine.execute_action(breakout, {}, 150)  # equal priority: ignored
+        await asyncio.sleep(0)
+        assert started == ["breakout"] and cancelled == []
+        await engine.execute_action(alert, {}, 200)  # higher priority: preempts
+        await asyncio.sleep(0)
+        assert started == ["breakout", "alert"] and cancelled == ["breakout"]
+    finally:
+        await engine.cancel_current_action()
+
+def test_condition_memo_keys_on_value_and_type(loaded_modules):
+    m = loaded_modules.get("roc_main")
+    if m is None:
+        pytest.skip("roc_main not importable")
+    engine = m.SceneEngine({}, logging.getLogger("roc-test-memo"))
+    (rule,) = engine._compile_rules([{
+        "name": "memo", "priority": 1,
+        "conditions": [{"field": "x", "operator": "contains", "value": "1.0"}],
+        "action": {"type": "switch_scene", "scene": "s"},
+    }])
+    # 1, 1.0 and True hash alike but stringify differently; lists are unhashable
+    frames = [
+        ({"x": 1}, False), ({"x": 1.0}, True), ({"x": True}, False), ({"x": 1.0}, True),
+        ({}, False), ({"x": ["1.0"]}, True), ({"x": ["1.0"]}, True), ({"x": 1}, False),
+    ]
+    for frame, expected in frames:
+        assert engine._conditions_match(rule, frame) is expected, frame
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_scene_switch_resends_and_rolls_back_on_failure(loaded_modules):
+    m = loaded_modules.get("roc_main")
+    if m is None:
+        pytest.skip("roc_main not importable")
+    engine = m.SceneEngine({}, logging.getLogger("roc-test-switch"))
+    calls, fail = [], []
+
+    class OBS:
+        async def set_current_scene(self, scene):
+            calls.append(scene)
+            if fail:
+                raise RuntimeError("OBS unavailable")
+    engine.obs_connection = OBS()
+    engine.obs_max_retries = 0
+
+    # A repeat request still reaches OBS: an operator may have switched away by hand
+    for scene in ("game", "game"):
+        await engine.switch_to_scene(scene)
+        await engine._scene_switch_task
+    assert calls == ["game", "game"]
+
+    switched_at = engine.last_scene_change
+    fail.append(True)
+    await engine.switch_to_scene("break")
+    await engine._scene_switch_task
+    assert calls[-1] == "break"
+    assert engine.current_scene == "game" and engine.last_scene_change == switched_at
+'''
+
+PYTEST_INI = b'''\
+[pytest]
+asyncio_mode = auto
+asyncio_default_fixture_loop_scope = session
+'''
+
+README = b'''\
 ROC Deep Test Suite
 ===================
 
@@ -220,10 +537,15 @@ They are intentionally defensive and try many common names/entrypoints to avoid
 
 What is included:
 - conftest.py: pytest fixtures creating a safe config dir (`ROC_CONFIG_DIR`) that mimics `/etc/roc`.
+  It is cached by content hash under `$XDG_CACHE_HOME/roc-tests/` (default `~/.cache`) and reused across runs.
+- pytest.ini: enables pytest-asyncio's auto mode with a session-scoped loop (uvloop when installed).
 - obs_mock_server.py: a small asyncio websockets-based mock server that simulates OBS responses.
-- tests_test_scene_engine.py: scene engine import & smoke tests that try many likely symbols.
-- tests_test_obs.py: OBS mock server tests and safe subprocess checks.
+- tests_test_scene_engine.py: scene engine import & smoke tests that try many likely symbols,
+  plus behaviour tests for SceneEngineAdvanced rule selection.
+- tests_test_obs.py: OBS mock server tests and in-process import checks.
 - tests_test_ffmpeg.py: ffmpeg command builder smoke tests.
+- tests_test_main.py: roc_main regression tests (custom rule code execution, action preemption,
+  condition memoization, scene switch delivery).
 
 How to run:
 1. Clone your repo locally:
@@ -234,15 +556,41 @@ How to run:
 3. (Optional) Create virtualenv and install deps:
    python3 -m venv venv
    source venv/bin/activate
-   pip install pytest websockets
+   pip install pytest "pytest-asyncio>=0.24" websockets
+   pip install orjson msgspec   # optional, faster JSON and typed rule loading
 4. Run pytest:
    pytest -q
 
 Notes:
-- Tests avoid modifying repo files. They create temporary config dirs and run risky imports in subprocesses.
+- Tests avoid modifying repo files. They write their config dir to the user's cache directory
+  (`$XDG_CACHE_HOME/roc-tests/`, default `~/.cache/roc-tests/`), falling back to a pytest temp dir
+  if that is not writable, and import repo modules once per session.
 - These tests are intentionally permissive; they aim to exercise surface APIs to guide creation of deeper tests.
-MD
+'''
+
+FILES = {
+    "conftest.py": CONFTEST,
+    "tests_test_scene_engine.py": TEST_SCENE_ENGINE,
+    "obs_mock_server.py": OBS_MOCK_SERVER,
+    "tests_test_obs.py": TEST_OBS,
+    "tests_test_ffmpeg.py": TEST_FFMPEG,
+    "tests_test_main.py": TEST_MAIN,
+    "pytest.ini": PYTEST_INI,
+    "README.md": README,
+}
 
-cd /tmp
-zip -r roc_deep_test_suite.zip "$(basename "$out")"
-echo "Created /tmp/roc_deep_test_suite and /tmp/roc_deep_test_suite.zip"
+def main():
+    shutil.rmtree(OUT, ignore_errors=True)
+    OUT.mkdir(parents=True)
+    for name, payload in FILES.items():
+        (OUT / name).write_bytes(payload)
+    archive = OUT.with_suffix(".zip")
+    # Stored, not deflated: the suite is a handful of small text files.
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_STORED) as zf:
+        zf.write(OUT, OUT.name)
+        for name, payload in FILES.items():
+            zf.writestr(f"{OUT.name}/{name}", payload)
+    print(f"Created {OUT} and {archive}")
+
+if __name__ == "__main__":
+    main()